@@ -0,0 +1,113 @@
+import argparse
+import getpass
+import json
+import logging
+import os
+import sys
+
+# Headless batch runner: runs a list of (job title, location) queries through dice_bot.run_batch without
+# the Streamlit UI. Queries come from a file with one 'job title | location' per line and/or --query options.
+# Re-running the same queries for the same account resumes an interrupted batch from its checkpoint.
+#
+#   DICE_EMAIL=me@example.com python dice_batch.py queries.txt --spreadsheet-id <id> --google-credentials sa.json
+#   python dice_batch.py --query "Data Engineer | Remote" --query "SRE | Austin, TX" --sessions 2 --workers 3 ...
+
+class LogStatus:
+    """Stands in for a Streamlit status placeholder by writing every status message to the log."""
+
+    def info(self, message):
+        logging.info(f"STATUS: {message}")
+
+    def success(self, message):
+        logging.info(f"STATUS: {message}")
+
+    def warning(self, message):
+        logging.warning(f"STATUS: {message}")
+
+    def error(self, message):
+        logging.error(f"STATUS: {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several Dice job searches as one resumable batch.")
+    parser.add_argument("queries_file", nargs="?", help="File with one 'job title | location' per line ('#' starts a comment line)")
+    parser.add_argument("--query", action="append", default=[], help="A 'job title | location' query; may be repeated")
+    parser.add_argument("--email", default=os.environ.get("DICE_EMAIL"), help="Dice account email (default: $DICE_EMAIL)")
+    parser.add_argument("--spreadsheet-id", required=True)
+    parser.add_argument("--google-credentials", default=os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"),
+                        help="Service account JSON file (default: $GOOGLE_APPLICATION_CREDENTIALS)")
+    parser.add_argument("--sessions", type=int, default=1, help="Logged-in search browsers working through the queries")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel job-page browsers per session")
+    parser.add_argument("--search-mode", choices=["url", "dashboard"], default="url")
+    parser.add_argument("--no-block-resources", action="store_true", help="Load images, fonts and trackers")
+    parser.add_argument("--actions-per-minute", type=int, help="Page loads and clicks per minute across all sessions (default: dice_bot.PACE_ACTIONS_PER_MINUTE)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: derived from the account and the queries)")
+    filters = parser.add_argument_group("listing filters", "applied to each job card before its page is opened")
+    filters.add_argument("--include", action="append", default=[], help="Keyword the title must contain (any of them); may be repeated")
+    filters.add_argument("--exclude", action="append", default=[], help="Skip titles containing this keyword; may be repeated")
+    filters.add_argument("--include-regex", action="append", default=[], help="Regex the title must match (any of them); may be repeated")
+    filters.add_argument("--exclude-regex", action="append", default=[], help="Skip titles matching this regex; may be repeated")
+    filters.add_argument("--block-company", action="append", default=[], help="Skip companies containing this name; may be repeated")
+    filters.add_argument("--max-age-days", type=int, help="Skip jobs posted more than this many days ago")
+    filters.add_argument("--easy-apply-only", action="store_true", help="Skip cards without an Easy Apply badge")
+    args = parser.parse_args()
+
+    import dice_bot # Imported after argument parsing so --help stays fast
+    if args.actions_per_minute:
+        dice_bot.PACER.actions_per_minute = args.actions_per_minute
+
+    query_lines = list(args.query)
+    if args.queries_file:
+        with open(args.queries_file, encoding="utf-8") as f:
+            query_lines.append(f.read())
+    try:
+        queries = dice_bot.parse_batch_queries("\n".join(query_lines))
+    except ValueError as e:
+        parser.error(str(e))
+    if not queries:
+        parser.error("no queries given; pass a queries file or --query")
+    if not args.email:
+        parser.error("no Dice email; pass --email or set DICE_EMAIL")
+    if not args.google_credentials:
+        parser.error("no Google service account file; pass --google-credentials or set GOOGLE_APPLICATION_CREDENTIALS")
+    try:
+        listing_filter = dice_bot.ListingFilter(args.include, args.exclude, args.include_regex, args.exclude_regex,
+                                                args.block_company, args.max_age_days, args.easy_apply_only)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        with open(args.google_credentials, encoding="utf-8") as f:
+            google_creds_dict = json.load(f)
+    except (OSError, ValueError) as e:
+        parser.error(f"cannot read the Google service account file {args.google_credentials}: {e}")
+    password = os.environ.get("DICE_PASSWORD") or getpass.getpass(f"Dice password for {args.email}: ")
+
+    summary = dice_bot.run_batch(
+        queries,
+        args.email,
+        password,
+        google_creds_dict,
+        args.spreadsheet_id,
+        LogStatus(),
+        sessions=args.sessions,
+        worker_count=min(max(args.workers, 1), dice_bot.MAX_WORKERS),
+        block_resources=not args.no_block_resources,
+        search_mode=args.search_mode,
+        checkpoint_path=args.checkpoint,
+        listing_filter=listing_filter,
+    )
+    if summary is None:
+        sys.exit(1) # The batch could not start
+    if "jobs" in summary:
+        logging.info(f"Batch summary: {summary['jobs']} jobs in {summary['wall_seconds'] / 60:.1f} min, "
+                     f"outcomes {json.dumps({k: v for k, v in summary['outcomes'].items() if v})}, "
+                     f"skipped before opening {json.dumps(summary['skipped'])}")
+    # A batch with queries left over keeps its checkpoint; exit non-zero so callers can re-run it
+    batch = summary["batch"]
+    if batch["pending"]:
+        logging.info(f"Queries left for the next run: {batch['pending']} (failed: {batch['failed']}, cancelled: {batch['cancelled']}).")
+    sys.exit(1 if batch["pending"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from dice_standin import start_standin_server, parse_config_args, expected_kinds
+
+# Offline throughput benchmark: runs login_to_dice and search_and_apply end to end against the local
+# stand-in site with a fake worksheet, then reports jobs/min and per-phase latency from RunMetrics.
+# Needs Chromium and chromedriver, nothing else; no Dice account or Google credentials are used.
+#
+#   python dice_benchmark.py --pages 3 --jobs-per-page 20 --latency 0.1
+#   python dice_benchmark.py --min-jobs-per-minute 30 --json bench_output.json   # regression gate
+
+class FakeWorksheet:
+    """Stands in for a gspread worksheet; keeps every appended row in memory."""
+
+    def __init__(self):
+        self.rows = []
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def append_rows(self, rows):
+        with self._lock:
+            self.calls += 1
+            self.rows.extend(rows)
+
+    def append_row(self, row):
+        self.append_rows([row])
+
+
+def run_benchmark(args, base_url, server):
+    # dice_bot reads DICE_BASE_URL and DICE_BOT_DATA_DIR at import time, so import it only now.
+    os.environ["DICE_BASE_URL"] = base_url
+    os.environ["DICE_BOT_DATA_DIR"] = tempfile.mkdtemp(prefix="dice_bench_")
+    import dice_bot
+    if args.actions_per_minute:
+        dice_bot.PACER.actions_per_minute = args.actions_per_minute
+
+    worksheet = FakeWorksheet()
+    metrics = dice_bot.RunMetrics(run_id=f"bench-{int(time.time())}")
+    metrics.bind()
+    browser_pool = dice_bot.BrowserPool(args.block_resources)
+    writer = dice_bot.SheetWriter(worksheet, os.path.join(dice_bot.SHEET_SPOOL_DIR, "bench.jsonl"))
+    job_index = dice_bot.JobIndex()
+    driver = None
+    recycler = None
+    worker_pool = None
+    try:
+        with dice_bot.phase("driver_start"):
+            if args.chromedriver:
+                driver = dice_bot.create_driver(args.chromedriver, args.block_resources)
+            else:
+                driver = dice_bot.launch_browser(args.block_resources)
+        with dice_bot.phase("login"):
+            dice_bot.login_to_dice(driver, "bench@example.com", "bench-password")
+        recycler = dice_bot.BrowserRecycler(browser_pool, driver, max_pages=args.recycle_pages or dice_bot.RECYCLE_MAX_PAGES)
+        if args.workers > 1:
+            with dice_bot.phase("driver_start", workers=args.workers):
+                worker_pool = dice_bot.JobWorkerPool(driver, browser_pool, args.workers, writer, job_index)
+        dice_bot.search_and_apply(driver, "Stand-in Engineer", "Remote", writer, worker_pool, job_index, args.search_mode,
+                                  recycler=recycler)
+        if worker_pool:
+            worker_pool.close()
+    finally:
+        if worker_pool:
+            worker_pool.close()
+        if recycler:
+            driver = recycler.driver
+        if driver:
+            driver.quit()
+        browser_pool.close() # Worker browsers went back to the pool; don't leave them running
+        writer.close()
+        job_index.close()
+    summary = metrics.close()
+    summary["rows_written"] = len(worksheet.rows)
+    summary["sheet_calls"] = worksheet.calls
+    summary["server"] = dict(server.stats)
+    summary["browser_recycles"] = recycler.recycles if recycler else 0
+    return summary
+
+
+def print_report(summary, expected):
+    print()
+    print(f"Jobs processed:   {summary['jobs']}  ({summary['jobs_per_minute']:.1f} jobs/min over {summary['wall_seconds']:.1f}s)")
+    print(f"Time split:       sleeping {summary['sleeping_seconds']:.1f}s, waiting {summary['waiting_seconds']:.1f}s, working {summary['working_seconds']:.1f}s")
+    print(f"Outcomes:         {json.dumps({k: v for k, v in summary['outcomes'].items() if v})}")
+    print(f"Skipped unopened: {json.dumps(summary['skipped'])}")
+    print(f"Expected kinds:   {json.dumps({k: v for k, v in expected.items() if v})}")
+    print(f"Sheet rows:       {summary['rows_written']} in {summary['sheet_calls']} append_rows calls")
+    print(f"Browser recycles: {summary['browser_recycles']} (search browser)")
+    print(f"Stand-in server:  {json.dumps(summary['server'])}")
+    print()
+    print(f"{'phase':<28}{'count':>7}{'p50 (s)':>10}{'p95 (s)':>10}{'total (s)':>11}")
+    for name, p in sorted(summary["phases"].items(), key=lambda item: -item[1]["total"]):
+        print(f"{name:<28}{p['count']:>7}{p['p50']:>10.3f}{p['p95']:>10.3f}{p['total']:>11.2f}")
+
+
+def main():
+    parser = parse_config_args(argparse.ArgumentParser(description="Benchmark dice_bot against the local Dice stand-in."))
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--search-mode", choices=["url", "dashboard"], default="url")
+    parser.add_argument("--block-resources", action="store_true")
+    parser.add_argument("--actions-per-minute", type=int, help="Page loads and clicks per minute across all sessions (default: dice_bot.PACE_ACTIONS_PER_MINUTE)")
+    parser.add_argument("--recycle-pages", type=int, help="Recycle the search browser after this many pages, to exercise recycling")
+    parser.add_argument("--chromedriver", help="Path to chromedriver; resolved through webdriver-manager if omitted")
+    parser.add_argument("--json", help="Also write the summary to this file")
+    parser.add_argument("--min-jobs-per-minute", type=float, default=0.0, help="Exit non-zero below this throughput")
+    args = parser.parse_args()
+
+    config_keys = set(parse_config_args(argparse.ArgumentParser()).parse_args([]).__dict__)
+    config = {key: value for key, value in vars(args).items() if key in config_keys}
+    server, base_url = start_standin_server(config)
+    try:
+        summary = run_benchmark(args, base_url, server)
+    finally:
+        server.shutdown()
+
+    expected = expected_kinds(server.config)
+    print_report(summary, expected)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**summary, "expected_kinds": expected, "config": server.config}, f, indent=2)
+
+    problems = []
+    expected_applied = expected["easy-apply"] - summary["server"]["failures_injected"]
+    if summary["outcomes"]["applied"] < expected_applied:
+        problems.append(f"applied {summary['outcomes']['applied']} jobs, expected at least {expected_applied}")
+    if summary["rows_written"] != summary["outcomes"]["applied"]:
+        problems.append(f"wrote {summary['rows_written']} sheet rows for {summary['outcomes']['applied']} applications")
+    if summary["jobs_per_minute"] < args.min_jobs_per_minute:
+        problems.append(f"{summary['jobs_per_minute']:.1f} jobs/min is below the {args.min_jobs_per_minute} floor")
+    for problem in problems:
+        logging.error(f"BENCHMARK CHECK FAILED: {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import streamlit as st
 import json
+import os
 
 # --- Streamlit Configuration (MUST be first) ---
-st.set_page_config(page_title="Dice.com Job Application Bot", page_icon="🤖", layout="wide")
+if st.runtime.exists():
+    st.set_page_config(page_title="Dice.com Job Application Bot", page_icon="🤖", layout="wide")
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -11,41 +13,841 @@ from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.core.os_manager import ChromeType # For specifying Chromium
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, ElementClickInterceptedException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException, SessionNotCreatedException
 import time
 import traceback
 import logging
+import threading
+import queue
+import sqlite3
+import hashlib
+import bisect
+import re
+import weakref
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlparse, urlencode
 import gspread
 from google.oauth2.service_account import Credentials # Using google-auth for service account
 from datetime import datetime
 import pytz
+try:
+    import psutil # Optional: browser memory is read from /proc when it is missing
+except ImportError:
+    psutil = None
 
 # --- Basic Configuration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# --- SPEED CONFIGURATION ---
-ACTION_DELAY = 1.5 # You can adjust this
+# --- SITE CONFIGURATION ---
+DICE_BASE_URL = os.environ.get("DICE_BASE_URL", "https://www.dice.com").rstrip("/") # Point at dice_standin.py for offline runs
+
+# --- LOCAL STATE ---
+DATA_DIR = os.environ.get("DICE_BOT_DATA_DIR", ".dice_bot_data") # Spools, indexes and caches live here
+
+# --- PACING CONFIGURATION ---
+PACE_BASE_DELAY = 1.5 # Settle delay after keystrokes and clicks until responses show the site is fast
+PACE_MIN_DELAY = 0.3 # Floor the settle delay shrinks to while responses stay fast and error-free
+PACE_MAX_DELAY = 60.0 # Ceiling of the exponential back-off
+PACE_SPEEDUP = 0.85 # Settle delay multiplier per fast, clean response
+PACE_BACKOFF = 2.0 # Settle delay multiplier per throttling sign (timeout, interstitial, captcha, error page)
+PACE_FAST_RESPONSE = 2.0 # Seconds; a job page that classifies faster than this counts as fast
+PACE_ACTIONS_PER_MINUTE = 120 # Page loads and clicks per minute across every browser session in the process
+PACE_THROTTLE_RETRIES = 2 # Reloads of a results page that came back as an interstitial
+
+# --- ADAPTIVE WAIT CONFIGURATION ---
+WAIT_MIN_TIMEOUT = 2.0 # Never give a step less than this, however fast it has been
+WAIT_MAX_TIMEOUT = 30.0 # Never give a step more than this, however slow it has been
+WAIT_TIMEOUT_MULTIPLIER = 3.0 # Step timeout = multiplier x p95 of its recent latencies (timeouts included)
+WAIT_MIN_SAMPLES = 5 # Use the caller's default timeout until a step has this many samples
+WAIT_HISTORY_SIZE = 50 # Recent latencies kept per step
+WAIT_POLL_FREQUENCY = 0.2
+NETWORK_IDLE_QUIET_PERIOD = 0.5 # Seconds without a new finished request before the network counts as idle
+
+JOB_LINKS_CSS = "a[data-testid='job-search-job-detail-link']"
+# Elements that only exist on the logged-in dashboard
+DASHBOARD_MARKER_XPATH = "//*[contains(@data-testid,'header-user-menu')] | //*[contains(text(),'My Profile')] | //*[contains(text(),'Recommended For You')]"
+
+# --- SEARCH CONFIGURATION ---
+SEARCH_MODE_URL = "url" # Open results pages by URL, prefetching the next page
+SEARCH_MODE_DASHBOARD = "dashboard" # Type into the dashboard form and click through filters and 'Next'
+DICE_SEARCH_URL = f"{DICE_BASE_URL}/jobs"
+SEARCH_PAGE_SIZE = 20
+# Filters baked into the results URL; the dashboard mode clicks the same two in the filter panel
+SEARCH_URL_FILTERS = {"filters.easyApply": "true", "filters.workplaceTypes": "Remote"}
+NEXT_PAGE_BUTTON_XPATH = "//span[@aria-label='Next']/ancestor::button"
+
+# --- WORKER POOL CONFIGURATION ---
+MAX_WORKERS = 8 # Upper bound for parallel browser sessions offered in the UI
+
+# Outcomes of processing one job detail page
+OUTCOME_APPLIED = "applied"
+OUTCOME_ALREADY_APPLIED = "already-applied"
+OUTCOME_NOT_EASY_APPLY = "not-easy-apply"
+OUTCOME_EXTERNAL_APPLY = "external-apply"
+OUTCOME_SCREENING_QUESTIONS = "screening-questions"
+OUTCOME_PAGE_ERROR = "page-error"
+OUTCOME_THROTTLED = "throttled" # Captcha, bot check or rate-limit page instead of the job; retried next run
+OUTCOME_ERROR = "error"
+ALL_OUTCOMES = (OUTCOME_APPLIED, OUTCOME_ALREADY_APPLIED, OUTCOME_NOT_EASY_APPLY, OUTCOME_EXTERNAL_APPLY,
+                OUTCOME_SCREENING_QUESTIONS, OUTCOME_PAGE_ERROR, OUTCOME_THROTTLED, OUTCOME_ERROR)
+
+# --- JOB INDEX CONFIGURATION ---
+JOB_INDEX_PATH = os.path.join(DATA_DIR, "job_index.sqlite3")
+# Outcomes that keep a job from ever being opened again
+JOB_FINAL_OUTCOMES = (OUTCOME_APPLIED, OUTCOME_ALREADY_APPLIED)
+# How long any other recorded outcome keeps a job from being opened again
+JOB_RETRY_TTL = {
+    OUTCOME_NOT_EASY_APPLY: 7 * 24 * 3600,
+    OUTCOME_EXTERNAL_APPLY: 7 * 24 * 3600,
+    OUTCOME_SCREENING_QUESTIONS: 7 * 24 * 3600,
+    OUTCOME_PAGE_ERROR: 6 * 3600,
+    OUTCOME_ERROR: 6 * 3600,
+}
+
+# --- JOB INDEX ---
+def extract_job_id(job_url):
+    """Returns the Dice job ID (last path segment of a job-detail link), or None."""
+    if not job_url:
+        return None
+    return urlparse(job_url).path.rstrip("/").rsplit("/", 1)[-1] or None
+
+class JobIndex:
+    """SQLite record of every job the bot has opened, keyed by Dice job ID, so known jobs are skipped without a tab."""
+
+    def __init__(self, path=JOB_INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY, outcome TEXT NOT NULL, title TEXT, url TEXT,"
+            " first_seen REAL NOT NULL, updated_at REAL NOT NULL, attempts INTEGER NOT NULL DEFAULT 1)"
+        )
+        self._conn.commit()
+
+    def skip_reason(self, job_id):
+        """Returns the recorded outcome if the job should not be opened again yet, else None."""
+        if not job_id:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT outcome, updated_at FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        outcome, updated_at = row
+        if outcome in JOB_FINAL_OUTCOMES:
+            return outcome
+        ttl = JOB_RETRY_TTL.get(outcome, 0)
+        return outcome if time.time() - updated_at < ttl else None
+
+    def record(self, job_id, outcome, title=None, url=None):
+        if not job_id:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, outcome, title, url, first_seen, updated_at) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(job_id) DO UPDATE SET outcome = excluded.outcome, title = excluded.title,"
+                " url = excluded.url, updated_at = excluded.updated_at, attempts = attempts + 1",
+                (job_id, outcome, title, url, now, now),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# --- RUN METRICS ---
+RUN_METRICS_DIR = os.path.join(DATA_DIR, "runs")
+SPAN_WORK = "work"
+SPAN_WAIT = "wait"
+SPAN_SLEEP = "sleep"
+
+_run_context = threading.local() # .metrics and .depth for the thread doing the work
+
+class RunMetrics:
+    """Timing spans for one run, streamed to DATA_DIR/runs/<run_id>.jsonl and summarised at the end.
+
+    Spans are recorded against the RunMetrics bound to the current thread (see bind()), so the worker
+    and collector threads of a run report into the same file. A run started from the UI also carries
+    its RunControl here, which is how progress events and cancellation reach those threads.
+    """
+
+    def __init__(self, run_id=None, control=None):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S-") + os.urandom(2).hex()
+        self.control = control
+        os.makedirs(RUN_METRICS_DIR, exist_ok=True)
+        self.path = os.path.join(RUN_METRICS_DIR, f"{self.run_id}.jsonl")
+        self.started = time.monotonic()
+        self.outcomes = dict.fromkeys(ALL_OUTCOMES, 0)
+        self.skipped = {} # skip reason -> listings dropped before their detail page was opened
+        self._durations = {} # phase -> [seconds]
+        self._kind_totals = {SPAN_WORK: 0.0, SPAN_WAIT: 0.0, SPAN_SLEEP: 0.0}
+        self._top_level_total = 0.0
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def bind(self):
+        """Makes this the RunMetrics that phase(), pause() and the waiter report to on the calling thread."""
+        _run_context.metrics = self
+        _run_context.depth = 0
+
+    @staticmethod
+    def unbind():
+        _run_context.metrics = None
+
+    @contextmanager
+    def span(self, phase_name, kind=SPAN_WORK, **fields):
+        depth = getattr(_run_context, "depth", 0)
+        _run_context.depth = depth + 1
+        started_at = time.time()
+        started = time.monotonic()
+        status = "ok"
+        try:
+            yield
+        except TimeoutException:
+            status = "timeout"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            _run_context.depth = depth
+            self._record(phase_name, kind, started_at, time.monotonic() - started, status, depth, fields)
+
+    def record_span(self, phase_name, started_at, duration, status="ok", kind=SPAN_WORK, **fields):
+        """Records a top-level span timed outside span(), e.g. by a helper thread that serves several runs."""
+        self._record(phase_name, kind, started_at, duration, status, 0, fields)
+
+    def _record(self, phase_name, kind, started_at, duration, status, depth, fields):
+        line = {"run_id": self.run_id, "phase": phase_name, "kind": kind, "start": round(started_at, 3),
+                "duration": round(duration, 4), "status": status, "depth": depth,
+                "thread": threading.current_thread().name, **fields}
+        with self._lock:
+            self._durations.setdefault(phase_name, []).append(duration)
+            if kind != SPAN_WORK:
+                self._kind_totals[kind] += duration
+            if depth == 0:
+                self._top_level_total += duration
+            if not self._file.closed:
+                self._file.write(json.dumps(line) + "\n")
+
+    def count_job(self, outcome):
+        with self._lock:
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def count_skip(self, reason, count=1):
+        with self._lock:
+            self.skipped[reason] = self.skipped.get(reason, 0) + count
+
+    def summary(self):
+        """Returns per-phase p50/p95, jobs/min and the sleeping/waiting/working split."""
+        with self._lock:
+            durations = {name: sorted(values) for name, values in self._durations.items()}
+            kind_totals = dict(self._kind_totals)
+            busy = self._top_level_total
+            outcomes = dict(self.outcomes)
+            skipped = dict(self.skipped)
+        wall = time.monotonic() - self.started
+        jobs = sum(outcomes.values())
+        phases = {
+            name: {
+                "count": len(values),
+                "p50": values[len(values) // 2],
+                "p95": values[int(0.95 * (len(values) - 1))],
+                "total": sum(values),
+            }
+            for name, values in durations.items()
+        }
+        return {
+            "run_id": self.run_id,
+            "wall_seconds": wall,
+            "jobs": jobs,
+            "jobs_per_minute": jobs / (wall / 60) if wall > 0 else 0.0,
+            "outcomes": outcomes,
+            "skipped": skipped,
+            "phases": phases,
+            "sleeping_seconds": kind_totals[SPAN_SLEEP],
+            "waiting_seconds": kind_totals[SPAN_WAIT],
+            "working_seconds": max(busy - kind_totals[SPAN_SLEEP] - kind_totals[SPAN_WAIT], 0.0),
+        }
+
+    def close(self):
+        """Writes the summary as the last JSONL line and closes the file. Returns the summary."""
+        summary = self.summary()
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(json.dumps({"type": "summary", **summary}) + "\n")
+                self._file.close()
+        logging.info(f"Run metrics written to {self.path}: {summary['jobs']} jobs, {summary['jobs_per_minute']:.1f} jobs/min.")
+        return summary
+
+def current_run_metrics():
+    return getattr(_run_context, "metrics", None)
+
+def phase(phase_name, kind=SPAN_WORK, **fields):
+    """Times a block as a span of the current thread's run, or does nothing outside a run."""
+    metrics = current_run_metrics()
+    return metrics.span(phase_name, kind, **fields) if metrics else nullcontext()
+
+def count_job(outcome):
+    metrics = current_run_metrics()
+    if metrics:
+        metrics.count_job(outcome)
+    emit_progress("job", outcome=outcome)
+
+def count_skip(reason, count=1):
+    metrics = current_run_metrics()
+    if metrics and count:
+        metrics.count_skip(reason, count)
+
+def pause(seconds, phase_name="action_delay"):
+    """time.sleep that shows up as sleeping time in the run metrics."""
+    with phase(phase_name, SPAN_SLEEP):
+        time.sleep(seconds)
+
+# --- RUN CONTROL ---
+class RunControl:
+    """Progress event queue and cancel flag of a run that executes off the Streamlit script thread."""
+
+    def __init__(self):
+        self.events = queue.Queue()
+        self._cancel = threading.Event()
+
+    def emit(self, event_type, **fields):
+        self.events.put({"type": event_type, "time": time.monotonic(), **fields})
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+class RunStatus:
+    """Status placeholder for a background run: every message becomes a 'status' event instead of UI output."""
+
+    def __init__(self, control):
+        self.control = control
+
+    def info(self, message):
+        self.control.emit("status", level="info", message=message)
+
+    def success(self, message):
+        self.control.emit("status", level="success", message=message)
+
+    def warning(self, message):
+        self.control.emit("status", level="warning", message=message)
+
+    def error(self, message):
+        self.control.emit("status", level="error", message=message)
+
+def current_run_control():
+    metrics = current_run_metrics()
+    return metrics.control if metrics else None
+
+def emit_progress(event_type, **fields):
+    """Sends a progress event to the UI watching the current thread's run, if there is one."""
+    control = current_run_control()
+    if control:
+        control.emit(event_type, **fields)
+
+def cancel_requested():
+    """True once the current thread's run has been asked to stop; checked between jobs and pages."""
+    control = current_run_control()
+    return bool(control and control.cancelled)
+
+# --- ADAPTIVE WAIT ENGINE ---
+class AdaptiveWaiter:
+    """Waits on readiness conditions and tunes each step's timeout from its observed latencies."""
+
+    def __init__(self):
+        self._samples = {} # step -> deque of wait durations (seconds); timed-out waits count at their timeout
+        self._timeouts = {} # step -> number of waits that timed out
+        self._lock = threading.Lock()
+
+    def timeout_for(self, step, default_timeout):
+        """Returns the timeout to use for a step, falling back to the default until enough samples exist."""
+        with self._lock:
+            samples = sorted(self._samples.get(step, ()))
+        if len(samples) < WAIT_MIN_SAMPLES:
+            return default_timeout
+        p95 = samples[int(0.95 * (len(samples) - 1))]
+        return min(max(p95 * WAIT_TIMEOUT_MULTIPLIER, WAIT_MIN_TIMEOUT), WAIT_MAX_TIMEOUT)
+
+    def until(self, driver, step, condition, default_timeout=10):
+        """Waits for a condition like WebDriverWait.until, recording how long the step took."""
+        timeout = self.timeout_for(step, default_timeout)
+        started = time.monotonic()
+        try:
+            with phase(f"wait:{step}", SPAN_WAIT, timeout=round(timeout, 2)):
+                result = WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_FREQUENCY).until(condition)
+        except TimeoutException:
+            # Record the miss at the timeout itself so the p95 (and the next timeout) widens after slow periods
+            with self._lock:
+                self._timeouts[step] = self._timeouts.get(step, 0) + 1
+                self._samples.setdefault(step, deque(maxlen=WAIT_HISTORY_SIZE)).append(timeout)
+            logging.debug(f"Wait step '{step}' timed out after {timeout:.1f}s.")
+            raise
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._samples.setdefault(step, deque(maxlen=WAIT_HISTORY_SIZE)).append(elapsed)
+        logging.debug(f"Wait step '{step}' ready after {elapsed:.2f}s (timeout {timeout:.1f}s).")
+        return result
+
+    def try_until(self, driver, step, condition, default_timeout=10):
+        """Like until(), but returns None on timeout for waits that are only an optimisation."""
+        try:
+            return self.until(driver, step, condition, default_timeout)
+        except TimeoutException:
+            return None
+
+    def stats(self):
+        """Returns {step: {count, p50, p95, timeouts, timeout}} for every step seen so far."""
+        with self._lock:
+            snapshot = {step: sorted(samples) for step, samples in self._samples.items()}
+            timeouts = dict(self._timeouts)
+        report = {}
+        for step in set(snapshot) | set(timeouts):
+            samples = snapshot.get(step, [])
+            report[step] = {
+                "count": len(samples),
+                "p50": samples[len(samples) // 2] if samples else None,
+                "p95": samples[int(0.95 * (len(samples) - 1))] if samples else None,
+                "timeouts": timeouts.get(step, 0),
+                "timeout": self.timeout_for(step, None),
+            }
+        return report
+
+    def log_stats(self):
+        for step, s in sorted(self.stats().items()):
+            if s["count"]:
+                logging.info(f"Wait stats '{step}': n={s['count']} p50={s['p50']:.2f}s p95={s['p95']:.2f}s timeouts={s['timeouts']} next timeout={s['timeout'] or 'default'}")
+            else:
+                logging.info(f"Wait stats '{step}': no successful waits, timeouts={s['timeouts']}")
+
+# Shared by every run in this process so later runs start from tuned timeouts.
+WAITER = AdaptiveWaiter()
+
+# --- PACING CONTROLLER ---
+class Pacer:
+    """Decides when the next browser action may go, for every session in the process.
+
+    Two limits apply. The settle delay after keystrokes and clicks shrinks while job pages respond fast and
+    cleanly, and doubles (holding back every session) on a sign of throttling outside a hold. The
+    actions-per-minute budget caps page loads and clicks over any 60 seconds, however fast the site is.
+    """
+
+    def __init__(self, actions_per_minute=PACE_ACTIONS_PER_MINUTE):
+        self.actions_per_minute = actions_per_minute
+        self.delay = PACE_BASE_DELAY
+        self.throttle_events = 0
+        self._hold_until = 0.0 # No session acts before this after a throttling sign
+        self._slots = [] # Times of recent and reserved actions, ascending
+        self._lock = threading.Lock()
+
+    def wait_turn(self, settle=True, phase_name="action_delay"):
+        """Blocks until this action's turn: after the settle delay (if settle), any back-off hold and the budget."""
+        with self._lock:
+            now = time.monotonic()
+            del self._slots[:bisect.bisect_right(self._slots, now - 60)]
+            settled_at = now + (self.delay if settle else 0.0)
+            ready_at = max(settled_at, self._hold_until)
+            if ready_at > settled_at:
+                phase_name = "throttle_backoff"
+            while True:
+                window = self._slots[bisect.bisect_right(self._slots, ready_at - 60):bisect.bisect_right(self._slots, ready_at)]
+                if len(window) < self.actions_per_minute:
+                    break
+                ready_at = window[0] + 60 # Wait for the oldest action in the window to age out
+                phase_name = "rate_budget"
+            bisect.insort(self._slots, ready_at)
+        if ready_at > now:
+            pause(ready_at - now, phase_name)
+
+    def observe(self, response_seconds):
+        """A page answered normally; fast answers shorten the settle delay."""
+        if response_seconds <= PACE_FAST_RESPONSE:
+            with self._lock:
+                self.delay = max(self.delay * PACE_SPEEDUP, PACE_MIN_DELAY)
+
+    def throttled(self, reason):
+        """A sign of throttling: back off exponentially and hold every session for the new delay.
+
+        Signs that arrive during a hold come from pages already in flight when it started, so they are
+        counted but back off no further; otherwise a few parallel workers would jump straight to the cap.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.throttle_events += 1
+            if now < self._hold_until:
+                logging.debug(f"Throttling sign ({reason}) during an active hold; not backing off again.")
+                return
+            self.delay = min(max(self.delay, PACE_BASE_DELAY) * PACE_BACKOFF, PACE_MAX_DELAY)
+            self._hold_until = now + self.delay
+            delay = self.delay
+        logging.warning(f"Throttling sign ({reason}); pacing back off to {delay:.1f}s between actions.")
+
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            recent = sum(1 for slot in self._slots if now - 60 < slot <= now)
+            return {"delay": self.delay, "throttle_events": self.throttle_events, "actions_last_minute": recent}
+
+# Shared by every run and session in this process, so the budget covers all of them.
+PACER = Pacer()
+
+class network_idle:
+    """Condition: no new resource request has finished for NETWORK_IDLE_QUIET_PERIOD seconds."""
+
+    def __init__(self, quiet_period=NETWORK_IDLE_QUIET_PERIOD):
+        self.quiet_period = quiet_period
+        self._last_count = None
+        self._since = None
+
+    def __call__(self, driver):
+        count = driver.execute_script(
+            "if (!window.__diceBotTimingBuffer) {"
+            "  performance.setResourceTimingBufferSize(5000); window.__diceBotTimingBuffer = true;"
+            "}"
+            "return performance.getEntriesByType('resource').length;"
+        )
+        now = time.monotonic()
+        if count != self._last_count:
+            self._last_count = count
+            self._since = now
+            return False
+        return now - self._since >= self.quiet_period
+
+# Containers that hold one search result around its job link
+JOB_CARD_CSS = "[data-testid*='card'], dhi-search-card, article, li"
+
+EXTRACT_LISTINGS_JS = """
+const postedPattern = /(posted[^\\n]*|\\b(today|yesterday|just now|\\d+\\+?\\s*(minute|hour|day|week|month)s?\\s+ago)\\b)/i;
+return Array.from(document.querySelectorAll(arguments[0])).map(a => {
+    const card = a.closest(arguments[1]) || a.parentElement;
+    const text = card ? card.innerText : '';
+    const company = card && card.querySelector("[data-testid*='company'], a[href*='company-profile'], [data-cy*='company']");
+    const posted = text.match(postedPattern);
+    return {
+        title: a.innerText.trim() || 'N/A',
+        url: a.href,
+        company: company ? company.innerText.trim() : '',
+        posted: posted ? posted[0].trim() : '',
+        easy_apply: /easy apply/i.test(text),
+    };
+});
+"""
+
+def extract_job_listings(driver):
+    """Reads every job card on the results page in one round trip into plain job records.
+
+    Each record has id, title, url, company, posted, easy_apply and its position on the page;
+    duplicate links to the same job are dropped.
+    """
+    listings = []
+    seen_ids = set()
+    for job in driver.execute_script(EXTRACT_LISTINGS_JS, JOB_LINKS_CSS, JOB_CARD_CSS):
+        job["id"] = extract_job_id(job["url"])
+        if job["id"] in seen_ids:
+            continue
+        seen_ids.add(job["id"])
+        job["position"] = len(listings)
+        listings.append(job)
+    return listings
+
+# --- LISTING FILTERS ---
+SKIP_KNOWN = "known" # Already in the job index
+SKIP_DUPLICATE = "duplicate" # Taken by another query of the batch
+SKIP_TITLE_EXCLUDED = "title-excluded"
+SKIP_TITLE_NOT_INCLUDED = "title-not-included"
+SKIP_COMPANY_BLOCKED = "company-blocked"
+SKIP_TOO_OLD = "too-old"
+SKIP_NO_EASY_APPLY_BADGE = "no-easy-apply-badge"
+
+POSTED_AGO_PATTERN = re.compile(r"(\d+)\+?\s*(minute|hour|day|week|month)s?\s+ago", re.IGNORECASE)
+POSTED_UNIT_DAYS = {"minute": 0, "hour": 0, "day": 1, "week": 7, "month": 30}
+
+def posted_age_days(posted):
+    """Days since posting from card text like 'Posted 3 days ago' or 'Today'; None when it can't be read."""
+    text = posted.lower()
+    if "today" in text or "just now" in text:
+        return 0
+    if "yesterday" in text:
+        return 1
+    match = POSTED_AGO_PATTERN.search(text)
+    if not match:
+        return None
+    return int(match.group(1)) * POSTED_UNIT_DAYS[match.group(2).lower()]
+
+def split_rule_list(text, separators=",\n"):
+    """Splits a comma or newline separated list of rules, dropping blanks."""
+    return [item.strip() for item in re.split(f"[{re.escape(separators)}]", text or "") if item.strip()]
+
+class ListingFilter:
+    """Rules applied to the job cards of a results page before any detail page is opened.
+
+    Keywords and the company blocklist match case-insensitively as substrings; patterns are regular
+    expressions searched in the title. Everything is compiled once, when the filter is built for a run.
+    A card whose posting age can't be read is never dropped for age.
+    """
+
+    def __init__(self, include_keywords=(), exclude_keywords=(), include_patterns=(), exclude_patterns=(),
+                 company_blocklist=(), max_age_days=None, easy_apply_only=False):
+        self.include = self._compile([re.escape(keyword) for keyword in include_keywords] + list(include_patterns))
+        self.exclude = self._compile([re.escape(keyword) for keyword in exclude_keywords] + list(exclude_patterns))
+        self.blocked_companies = tuple(company.casefold() for company in company_blocklist)
+        self.max_age_days = max_age_days
+        self.easy_apply_only = easy_apply_only
+
+    @staticmethod
+    def _compile(patterns):
+        """Compiles each pattern on its own, so inline flags, named groups and backreferences keep their meaning."""
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(re.compile(pattern, re.IGNORECASE))
+            except re.error as e:
+                raise ValueError(f"Invalid title pattern '{pattern}': {e}") from e
+        return tuple(compiled)
+
+    def __bool__(self):
+        return bool(self.include or self.exclude or self.blocked_companies or self.max_age_days is not None or self.easy_apply_only)
+
+    def skip_reason(self, job):
+        """The SKIP_* reason this listing is dropped for, or None to open it."""
+        if any(pattern.search(job["title"]) for pattern in self.exclude):
+            return SKIP_TITLE_EXCLUDED
+        if self.include and not any(pattern.search(job["title"]) for pattern in self.include):
+            return SKIP_TITLE_NOT_INCLUDED
+        company = job.get("company", "").casefold()
+        if company and any(blocked in company for blocked in self.blocked_companies):
+            return SKIP_COMPANY_BLOCKED
+        if self.max_age_days is not None:
+            age = posted_age_days(job.get("posted", ""))
+            if age is not None and age > self.max_age_days:
+                return SKIP_TOO_OLD
+        if self.easy_apply_only and not job.get("easy_apply"):
+            return SKIP_NO_EASY_APPLY_BADGE
+        return None
+
+    def apply(self, listings):
+        """Returns the listings to open and a {reason: count} of the ones dropped."""
+        kept = []
+        skipped = {}
+        for job in listings:
+            reason = self.skip_reason(job)
+            if reason:
+                skipped[reason] = skipped.get(reason, 0) + 1
+            else:
+                kept.append(job)
+        return kept, skipped
+
+def build_search_url(job_title, location, page_number):
+    """Returns the Dice results URL for a query, location and page with SEARCH_URL_FILTERS applied."""
+    params = {"q": job_title, "location": location, **SEARCH_URL_FILTERS, "page": page_number, "pageSize": SEARCH_PAGE_SIZE}
+    return f"{DICE_SEARCH_URL}?{urlencode(params)}"
+
+def next_page_available(driver, job_count):
+    """True if the results page has an enabled 'Next' button, or has no pagination but a full page of jobs."""
+    state = driver.execute_script(
+        "const button = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;"
+        "return button ? !button.disabled : null;",
+        NEXT_PAGE_BUTTON_XPATH,
+    )
+    return state if state is not None else job_count >= SEARCH_PAGE_SIZE
+
+def open_background_tab(driver, url):
+    """Opens a tab and starts loading the URL without waiting for it. The driver is left on the new tab."""
+    driver.switch_to.new_window("tab")
+    block_resources_in_current_tab(driver)
+    driver.execute_script("window.location.href = arguments[0];", url)
+    return driver.current_window_handle
+
+def current_job_hrefs(driver):
+    """Returns the hrefs of the job links currently on the results page."""
+    return driver.execute_script(
+        "return Array.from(document.querySelectorAll(arguments[0])).map(a => a.href);", JOB_LINKS_CSS
+    )
+
+class job_links_changed:
+    """Condition: the results page shows a non-empty job list different from the previous one."""
+
+    def __init__(self, previous_hrefs):
+        self.previous_hrefs = list(previous_hrefs or [])
+
+    def __call__(self, driver):
+        hrefs = current_job_hrefs(driver)
+        return hrefs if hrefs and hrefs != self.previous_hrefs else False
+
+
+# --- GOOGLE SHEETS WRITER CONFIGURATION ---
+SHEET_SPOOL_DIR = os.path.join(DATA_DIR, "sheet_spool")
+SHEET_FLUSH_BATCH_SIZE = 20 # Flush as soon as this many rows are pending...
+SHEET_FLUSH_INTERVAL = 15.0 # ...or when the oldest pending row is this many seconds old
+SHEET_BACKOFF_INITIAL = 10.0 # First pause after a quota (HTTP 429) or API error
+SHEET_BACKOFF_MAX = 300.0
+
+class SheetWriter:
+    """Buffers worksheet rows and appends them in batches from a background thread.
+
+    Drop-in for the worksheet's append_row. Each row is appended to a local spool file before
+    append_row returns and is removed from it only after append_rows succeeds, so a crash or a
+    quota error never loses a row; rows left in the spool by an earlier run are sent first.
+    A batch can hold rows from every run sharing the writer, so its sheet_write span goes to all of them.
+    """
+
+    def __init__(self, worksheet, spool_path, batch_size=SHEET_FLUSH_BATCH_SIZE, flush_interval=SHEET_FLUSH_INTERVAL):
+        self.worksheet = worksheet
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        metrics = current_run_metrics()
+        self._runs = [metrics] if metrics else [] # RunMetrics of the runs writing through this writer
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        os.makedirs(os.path.dirname(spool_path) or ".", exist_ok=True)
+        self._pending = self._load_spool()
+        self._oldest = time.monotonic() if self._pending else None
+        if self._pending:
+            logging.info(f"Recovered {len(self._pending)} unsent Google Sheets rows from {spool_path}.")
+        self._thread = threading.Thread(target=self._run, name="sheet-writer", daemon=True)
+        self._thread.start()
+
+    def _load_spool(self):
+        if not os.path.exists(self.spool_path):
+            return []
+        rows = []
+        with open(self.spool_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logging.warning(f"Skipping a corrupt line in Google Sheets spool {self.spool_path}.")
+        return rows
+
+    def _rewrite_spool(self, rows):
+        tmp_path = self.spool_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.spool_path)
+
+    def append_row(self, row):
+        """Queues a row for the next batch after making it durable in the spool."""
+        with self._lock:
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(row) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending.append(row)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def attach(self, metrics):
+        """Adds a run to the ones that get this writer's sheet_write spans."""
+        if metrics:
+            with self._lock:
+                self._runs.append(metrics)
+
+    def detach(self, metrics):
+        with self._lock:
+            if metrics in self._runs:
+                self._runs.remove(metrics)
+
+    def _record_write(self, row_count, started_at, started, status):
+        duration = time.monotonic() - started
+        with self._lock:
+            runs = list(self._runs)
+        for metrics in runs:
+            metrics.record_span("sheet_write", started_at, duration, status, rows=row_count)
+
+    def _due(self):
+        with self._lock:
+            if not self._pending or time.monotonic() < self._retry_at:
+                return False
+            return len(self._pending) >= self.batch_size or time.monotonic() - self._oldest >= self.flush_interval
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(timeout=1.0)
+            self._wake.clear()
+            if self._due():
+                self.flush()
+
+    def flush(self):
+        """Sends every pending row in one append_rows call. Returns True if nothing is left pending."""
+        with self._lock:
+            rows = list(self._pending)
+        if not rows:
+            return True
+        started_at = time.time()
+        started = time.monotonic()
+        try:
+            self.worksheet.append_rows(rows)
+        except Exception as e:
+            self._record_write(len(rows), started_at, started, "error")
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            self._backoff = min(self._backoff * 2 if self._backoff else SHEET_BACKOFF_INITIAL, SHEET_BACKOFF_MAX)
+            self._retry_at = time.monotonic() + self._backoff
+            if status == 429:
+                logging.warning(f"Google Sheets quota hit; {len(rows)} rows stay spooled, retrying in {self._backoff:.0f}s.")
+            else:
+                logging.error(f"Failed to append {len(rows)} rows to Google Sheets (retrying in {self._backoff:.0f}s): {e}")
+            return False
+        self._record_write(len(rows), started_at, started, "ok")
+        with self._lock:
+            del self._pending[:len(rows)]
+            self._oldest = time.monotonic() if self._pending else None
+            self._rewrite_spool(self._pending)
+            remaining = len(self._pending)
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self.rows_written += len(rows)
+        logging.info(f"Flushed {len(rows)} rows to Google Sheets.")
+        return remaining == 0
+
+    def close(self):
+        """Stops the background thread and makes a final flush; anything still unsent stays in the spool."""
+        if self._stopping:
+            return
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        if not self.flush():
+            logging.warning(f"{self.pending()} Google Sheets rows remain spooled in {self.spool_path} for the next run.")
 
 # --- GOOGLE SHEETS FUNCTION ---
 def log_to_google_sheet(worksheet, job_title):
-    """Logs a successful application to the specified Google Sheet."""
+    """Logs a successful application to the specified Google Sheet (or its SheetWriter)."""
     try:
         pakistan_tz = pytz.timezone('Asia/Karachi')
         current_time_pkt = datetime.now(pakistan_tz).strftime('%Y-%m-%d %H:%M:%S')
         row = [current_time_pkt, job_title, "Done"]
         worksheet.append_row(row)
-        logging.info(f"Successfully logged '{job_title}' to Google Sheets.")
+        logging.info(f"Logged '{job_title}' for Google Sheets.")
     except Exception as e:
         logging.error(f"Failed to log to Google Sheets: {e}")
         logging.error(traceback.format_exc())
 
-# Modified to accept email and password as parameters
-def login_to_dice(driver, dice_email_param, dice_password_param):
-    """Performs a full two-step login to Dice.com."""
-    logging.info(f"Initiating login to Dice.com with email: {dice_email_param[:5]}...") # Log part of email for privacy
-    driver.get("https://www.dice.com/dashboard/login")
-    time.sleep(2) # Allow initial page elements (like cookie banners) to load
-
+def dismiss_cookie_banner(driver):
+    """Accepts the cookie consent (CMP) banner if one shows up."""
     try:
         # Attempt to handle cookie consent / CMP wrapper
         WebDriverWait(driver, 7).until(
@@ -69,6 +871,7 @@ def login_to_dice(driver, dice_email_param, dice_password_param):
                     EC.element_to_be_clickable((selector_type, selector_value))
                 )
                 logging.info(f"Attempting to click cookie consent accept button with: {selector_value}")
+                PACER.wait_turn(settle=False)
                 accept_button.click()
                 accepted_cookie_banner = True
                 WebDriverWait(driver, 5).until(EC.invisibility_of_element_located((By.ID, "cmpwrapper")))
@@ -83,11 +886,22 @@ def login_to_dice(driver, dice_email_param, dice_password_param):
     except Exception as e_cmp:
         logging.warning(f"An error occurred trying to handle CMP wrapper: {e_cmp}. Proceeding...")
 
+# Modified to accept email and password as parameters
+def login_to_dice(driver, dice_email_param, dice_password_param):
+    """Performs a full two-step login to Dice.com."""
+    logging.info(f"Initiating login to Dice.com with email: {dice_email_param[:5]}...") # Log part of email for privacy
+    PACER.wait_turn(settle=False)
+    driver.get(f"{DICE_BASE_URL}/dashboard/login")
+    pause(2, "login_settle") # Allow initial page elements (like cookie banners) to load
+
+    with phase("cookie_banner"):
+        dismiss_cookie_banner(driver)
+
     try:
         logging.info("Step 1: Entering email.")
         email_input = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.NAME, "email")))
         email_input.send_keys(dice_email_param)
-        time.sleep(ACTION_DELAY)
+        PACER.wait_turn()
 
         logging.info("Clicking 'Continue' button (sign-in-button).")
         continue_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[@data-testid='sign-in-button']")))
@@ -96,12 +910,12 @@ def login_to_dice(driver, dice_email_param, dice_password_param):
         except ElementClickInterceptedException:
             logging.warning("ElementClickInterceptedException on continue_button (sign-in-button), trying JavaScript click.")
             driver.execute_script("arguments[0].click();", continue_button)
-        time.sleep(ACTION_DELAY)
+        PACER.wait_turn()
 
         logging.info("Step 2: Entering password.")
         password_input = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.NAME, "password")))
         password_input.send_keys(dice_password_param)
-        time.sleep(ACTION_DELAY)
+        PACER.wait_turn()
 
         logging.info("Clicking final 'Sign In' button (submit).")
         final_login_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[@type='submit']")))
@@ -111,7 +925,7 @@ def login_to_dice(driver, dice_email_param, dice_password_param):
             logging.warning("ElementClickInterceptedException on final_login_button (submit), trying JavaScript click.")
             driver.execute_script("arguments[0].click();", final_login_button)
         
-        time.sleep(3) # Increased wait after final login click for redirects
+        pause(3, "login_settle") # Increased wait after final login click for redirects
         logging.info(f"URL after login attempt: {driver.current_url}")
 
         # More robust check for successful login - look for an element unique to the logged-in dashboard
@@ -119,7 +933,7 @@ def login_to_dice(driver, dice_email_param, dice_password_param):
         # For example, a user profile name, a settings icon specific to logged-in state, etc.
         # Replace "user-profile-menu-button-id" with an actual reliable selector from Dice.com's dashboard.
         WebDriverWait(driver, 20).until(
-             EC.presence_of_element_located((By.XPATH, "//*[contains(@data-testid,'header-user-menu')] | //*[contains(text(),'My Profile')] | //*[contains(text(),'Recommended For You')]"))
+             EC.presence_of_element_located((By.XPATH, DASHBOARD_MARKER_XPATH))
         )
         logging.info(f"Login appears successful. Landed on dashboard: {driver.current_url}")
 
@@ -131,10 +945,229 @@ def login_to_dice(driver, dice_email_param, dice_password_param):
         logging.error(f"An unexpected error occurred during login: {e_global}. Current URL: {driver.current_url}")
         raise
 
-def search_and_apply(driver, job_title, location, worksheet):
-    """Searches for jobs, applies filters, and processes listings, logging successes."""
-    logging.info(f"Starting job search for '{job_title}' in '{location}'.")
-    
+# --- DETAIL PAGE CLASSIFIER ---
+APPLY_MAX_STEPS = 6 # Wizard pages to click through before giving up
+CLASSIFY_TIMEOUT = 15 # Default wait for a job page to classify; the waiter shortens it as samples come in
+APPLY_STEP_TIMEOUT = 15 # Default wait for each Easy Apply wizard step
+
+# Classifies a job detail page in one round trip. Returns null while the page is still rendering.
+# Captcha, bot-check and rate-limit interstitials, matched against the title, h1 and alerts of a page
+THROTTLE_NOTICE_PATTERN = "/captcha|are you a robot|unusual traffic|too many requests|access denied|checking your browser|something went wrong/i"
+CAPTCHA_CSS = "iframe[src*='captcha'], .g-recaptcha, .h-captcha, [data-sitekey], #challenge-form"
+PAGE_NOTICES_JS = "[document.title, ...Array.from(document.querySelectorAll('h1, [role=\"alert\"]'), el => el.innerText)].join(' ')"
+
+# True when the page is a throttling interstitial rather than the page that was asked for
+PAGE_THROTTLED_JS = "return " + THROTTLE_NOTICE_PATTERN + ".test(" + PAGE_NOTICES_JS + ") || !!document.querySelector(\"" + CAPTCHA_CSS + "\");"
+
+DETAIL_PROBE_JS = """
+if ((() => {""" + PAGE_THROTTLED_JS + """})()) return 'throttled';
+const notices = """ + PAGE_NOTICES_JS + """;
+if (/page not found|no longer available|job (has )?expired|position has been filled/i.test(notices)) return 'page-error';
+const host = document.querySelector('apply-button-wc');
+const root = host && host.shadowRoot;
+if (root) {
+    const label = root.textContent.trim();
+    if (/applied|application submitted/i.test(label)) return 'already-applied';
+    if (root.querySelector('button, a')) return /easy apply/i.test(label) ? 'easy-apply' : 'external-apply';
+}
+if (!host && document.readyState === 'complete' && customElements.get('apply-button-wc')) return 'no-apply-button';
+return null;
+"""
+
+# Describes the current Easy Apply wizard page. Returns null while it is still rendering.
+WIZARD_PROBE_JS = """
+const text = document.body ? document.body.innerText : '';
+if (/application (has been )?submitted|successfully applied|thank you for applying/i.test(text)) return {state: 'done'};
+const unanswered = Array.from(document.querySelectorAll('input[required], select[required], textarea[required]')).filter(el =>
+    el.type !== 'hidden' && el.type !== 'file' && el.offsetParent !== null &&
+    ((el.type === 'radio' || el.type === 'checkbox')
+        ? !document.querySelector(`input[name="${CSS.escape(el.name)}"]:checked`)
+        : !el.value));
+if (unanswered.length) return {state: 'questions', count: unanswered.length};
+const next = document.querySelector('button.btn-next');
+if (next && !next.disabled) {
+    const label = next.innerText.trim();
+    const heading = document.querySelector('h1, h2, h3, legend');
+    return {state: /submit/i.test(label) ? 'submit' : 'next', signature: [location.href, heading ? heading.innerText : '', label].join('|')};
+}
+const alert = Array.from(document.querySelectorAll('[role="alert"], .alert-danger')).find(el =>
+    el.offsetParent !== null && el.innerText.trim()); // Empty or hidden toast containers are not errors
+if (alert) return {state: 'error'};
+return null;
+"""
+
+DETAIL_STATE_OUTCOMES = {
+    "already-applied": OUTCOME_ALREADY_APPLIED,
+    "external-apply": OUTCOME_EXTERNAL_APPLY,
+    "no-apply-button": OUTCOME_NOT_EASY_APPLY,
+    "page-error": OUTCOME_PAGE_ERROR,
+    "throttled": OUTCOME_THROTTLED,
+}
+
+def detail_page_state(driver):
+    """Condition: the job detail page's classification once it can be made."""
+    return driver.execute_script(DETAIL_PROBE_JS)
+
+class left_detail_page:
+    """Condition: the tab has moved on from the job detail page, to a new document or a new URL."""
+
+    def __init__(self, detail_url):
+        self.detail_url = detail_url
+
+    def __call__(self, driver):
+        return driver.execute_script("return !window.__diceBotDetailPage || location.href !== arguments[0];", self.detail_url)
+
+class wizard_step_changed:
+    """Condition: the wizard shows a page other than the one with the given signature (or a terminal state)."""
+
+    def __init__(self, previous_signature):
+        self.previous_signature = previous_signature
+
+    def __call__(self, driver):
+        step = driver.execute_script(WIZARD_PROBE_JS)
+        if not step:
+            return False
+        if step["state"] in ("next", "submit") and step["signature"] == self.previous_signature:
+            return False
+        return step
+
+def click_wizard_button(driver):
+    PACER.wait_turn(settle=False)
+    next_button = driver.find_element(By.CSS_SELECTOR, "button.btn-next")
+    try:
+        next_button.click()
+    except ElementClickInterceptedException:
+        driver.execute_script("arguments[0].click();", next_button)
+
+def apply_to_job(driver, job_name):
+    """Classifies the job detail page open in the driver and, if it is Easy Apply, walks the wizard. Returns the outcome."""
+    with phase("classify"):
+        started = time.monotonic()
+        full_wait = WAITER.timeout_for("classify", CLASSIFY_TIMEOUT) >= CLASSIFY_TIMEOUT
+        state = WAITER.try_until(driver, "classify", detail_page_state, CLASSIFY_TIMEOUT)
+    if state == "throttled":
+        PACER.throttled(f"interstitial or captcha instead of job page '{job_name}'")
+    elif state is None:
+        # Missing a timeout the waiter shortened after fast pages is just a slow page, not throttling
+        if full_wait:
+            PACER.throttled(f"job page '{job_name}' did not render in {CLASSIFY_TIMEOUT}s")
+    else:
+        PACER.observe(time.monotonic() - started)
+    if state is None:
+        # Slow is not a classification: record it with the short error TTL so the job is retried soon
+        logging.warning(f"Job page '{job_name}' did not render in time to be classified. Skipping for now.")
+        return OUTCOME_ERROR
+    if state != "easy-apply":
+        outcome = DETAIL_STATE_OUTCOMES.get(state, OUTCOME_NOT_EASY_APPLY)
+        logging.info(f"Job '{job_name}' classified as {outcome}. Skipping.")
+        return outcome
+    with phase("apply"):
+        return run_easy_apply_wizard(driver, job_name)
+
+def run_easy_apply_wizard(driver, job_name):
+    """Clicks Easy Apply and steps through the wizard until it is submitted or can't continue. Returns the outcome."""
+    detail_url = driver.current_url
+    PACER.wait_turn(settle=False)
+    driver.execute_script(
+        "window.__diceBotDetailPage = true;" # Gone once the wizard's document replaces this one
+        "document.querySelector('apply-button-wc').shadowRoot.querySelector('button.btn.btn-primary, button').click();"
+    )
+    # Probing before the detail page has unloaded could read its alerts or text as the wizard's first step
+    if not WAITER.try_until(driver, "apply_open", left_detail_page(detail_url), APPLY_STEP_TIMEOUT):
+        logging.warning(f"Easy Apply for '{job_name}' did not open the application wizard. Skipping.")
+        return OUTCOME_ERROR
+    signature = None
+    for _ in range(APPLY_MAX_STEPS):
+        full_wait = WAITER.timeout_for("apply_step", APPLY_STEP_TIMEOUT) >= APPLY_STEP_TIMEOUT
+        step = WAITER.try_until(driver, "apply_step", wizard_step_changed(signature), APPLY_STEP_TIMEOUT)
+        if not step:
+            logging.warning(f"Easy Apply wizard for '{job_name}' stopped responding. Skipping.")
+            if full_wait:
+                PACER.throttled(f"Easy Apply wizard for '{job_name}' timed out")
+            return OUTCOME_ERROR
+        if step["state"] == "done":
+            break
+        if step["state"] == "questions":
+            logging.info(f"Job '{job_name}' asks {step['count']} screening question(s) the bot can't answer. Skipping.")
+            return OUTCOME_SCREENING_QUESTIONS
+        if step["state"] == "error":
+            logging.warning(f"Easy Apply wizard for '{job_name}' showed an error. Skipping.")
+            return OUTCOME_PAGE_ERROR
+        click_wizard_button(driver)
+        if step["state"] == "submit":
+            if not WAITER.try_until(driver, "apply_confirm", wizard_step_changed(step["signature"]), 10):
+                logging.warning(f"Submitted '{job_name}' but no confirmation page appeared.")
+            break
+        signature = step["signature"]
+    else:
+        logging.warning(f"Easy Apply wizard for '{job_name}' did not finish within {APPLY_MAX_STEPS} steps. Skipping.")
+        return OUTCOME_ERROR
+    logging.info(f"--- SUCCESS: Job '{job_name}' Submitted! ---")
+    return OUTCOME_APPLIED
+
+# --- SESSION REUSE ---
+SESSION_DIR = os.path.join(DATA_DIR, "sessions")
+SESSION_PROBE_TIMEOUT = 10
+
+def session_file_for(dice_email):
+    """Per-account cookie file; the name is a hash so the email isn't written to disk in clear."""
+    digest = hashlib.sha256(dice_email.strip().lower().encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SESSION_DIR, f"{digest}.json")
+
+def save_dice_session(driver, dice_email):
+    """Saves the authenticated cookies so the next run can skip login_to_dice."""
+    path = session_file_for(dice_email)
+    try:
+        os.makedirs(SESSION_DIR, exist_ok=True)
+        cookies = export_session_cookies(driver)
+        tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp" # Runs saving at once each write their own
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "cookies": cookies}, f)
+        os.replace(tmp_path, path)
+        logging.info(f"Saved {len(cookies)} session cookies for {dice_email[:5]}...")
+    except Exception as e:
+        logging.warning(f"Could not save the Dice session for reuse: {e}")
+
+def session_probe(driver):
+    """Condition: 'in' once a logged-in dashboard marker shows, 'out' if Dice shows the login form."""
+    return driver.execute_script(
+        "if (location.pathname.includes('login') || document.querySelector(\"input[name='email']\")) return 'out';"
+        "const marker = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null);"
+        "return marker.singleNodeValue ? 'in' : null;",
+        DASHBOARD_MARKER_XPATH,
+    )
+
+def restore_dice_session(driver, dice_email):
+    """Restores saved cookies and checks them with one dashboard load. Returns True if the session is live."""
+    path = session_file_for(dice_email)
+    if not os.path.exists(path):
+        logging.info("No saved Dice session for this account. Full login required.")
+        return False
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+        import_session_cookies(driver, saved["cookies"])
+        PACER.wait_turn(settle=False)
+        driver.get(f"{DICE_BASE_URL}/dashboard")
+        state = WAITER.until(driver, "session_probe", session_probe, SESSION_PROBE_TIMEOUT)
+    except TimeoutException:
+        state = None
+    except Exception as e:
+        logging.warning(f"Could not restore saved Dice session: {e}")
+        state = None
+    if state == "in":
+        logging.info(f"Restored saved Dice session. Landed on dashboard: {driver.current_url}")
+        return True
+    logging.info("Saved Dice session is no longer valid. Falling back to full login.")
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass # Another run on the same account already dropped it
+    return False
+
+def search_from_dashboard(driver, job_title, location):
+    """Runs a search through the dashboard form and the 'All filters' panel, leaving page 1 of the results open."""
     # Assuming login was successful, we should be on or able to navigate to the correct search area.
     # If the login directly lands on a page with search, this driver.get() might be redundant or even harmful.
     # Let's test by trying to find search elements directly first, assuming login landed correctly.
@@ -145,13 +1178,13 @@ def search_and_apply(driver, job_title, location, worksheet):
     logging.info(f"Current URL before attempting search: {driver.current_url}")
     if "login" in driver.current_url or "profiles" in driver.current_url and "dashboard" not in driver.current_url.split('?')[0]:
         logging.warning("It seems we are not on the main dashboard. Attempting to navigate to /dashboard again.")
-        driver.get("https://www.dice.com/dashboard")
-        time.sleep(3) # Wait for potential redirect
+        PACER.wait_turn(settle=False)
+        driver.get(f"{DICE_BASE_URL}/dashboard")
         logging.info(f"URL after re-navigating to /dashboard: {driver.current_url}")
         # Re-check if we are on a valid dashboard page
         try:
             WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, "//*[contains(@data-testid,'header-user-menu')] | //*[contains(text(),'My Profile')] | //*[contains(text(),'Recommended For You')] | //input[@name='q']"))
+                EC.presence_of_element_located((By.XPATH, DASHBOARD_MARKER_XPATH + " | //input[@name='q']"))
             )
             logging.info(f"Successfully on a dashboard-like page for search. Current URL: {driver.current_url}")
         except TimeoutException:
@@ -172,129 +1205,239 @@ def search_and_apply(driver, job_title, location, worksheet):
 
     job_title_field.clear()
     job_title_field.send_keys(job_title)
-    time.sleep(0.5)
+    PACER.wait_turn()
     location_field.clear()
     location_field.send_keys(location)
-    time.sleep(0.5)
+    PACER.wait_turn()
 
     logging.info("Clicking the main search button.")
     search_button_selector = (By.CSS_SELECTOR, "[data-testid='job-search-search-bar-search-button']")
     search_button = WebDriverWait(driver, 15).until(EC.element_to_be_clickable(search_button_selector))
+    PACER.wait_turn(settle=False)
     try:
         search_button.click()
     except ElementClickInterceptedException:
         logging.warning("ElementClickInterceptedException on search_button, trying JavaScript click.")
         driver.execute_script("arguments[0].click();", search_button)
     logging.info("Search initiated.")
-    time.sleep(5) # Wait for search results
-    # (The rest of search_and_apply: filters, job processing, pagination remains the same as your last good version)
-    # Ensure those selectors are also checked if issues arise later in the flow.
+    if not WAITER.try_until(driver, "search_results", EC.presence_of_all_elements_located((By.CSS_SELECTOR, JOB_LINKS_CSS)), 15):
+        logging.warning("Search results did not show any job links yet. Proceeding to filters anyway.")
+    with phase("filters"):
+        apply_search_filters(driver)
+
+def apply_search_filters(driver):
+    """Turns on the Easy Apply and Remote filters through the 'All filters' panel."""
     try:
         logging.info("Attempting to click 'All filters' button...")
         all_filters_button_selector = (By.XPATH, "//button[contains(., 'All filters')]")
         all_filters_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable(all_filters_button_selector))
+        unfiltered_hrefs = current_job_hrefs(driver)
+        PACER.wait_turn(settle=False)
         driver.execute_script("arguments[0].click();", all_filters_button) # JS click for robustness
-        time.sleep(ACTION_DELAY)
 
         logging.info("Clicking the 'Easy Apply' filter...")
         easy_apply_selector = (By.XPATH, "//label[contains(., 'Easy apply')]")
         easy_apply_filter = WebDriverWait(driver, 15).until(EC.element_to_be_clickable(easy_apply_selector))
+        PACER.wait_turn(settle=False)
         easy_apply_filter.click()
-        time.sleep(ACTION_DELAY)
+        WAITER.try_until(driver, "filter_refresh", network_idle(), 10)
 
         logging.info("Clicking the 'Remote' filter...")
         remote_filter_selector = (By.XPATH, "//label[contains(., 'Remote')]")
         remote_filter = WebDriverWait(driver, 15).until(EC.element_to_be_clickable(remote_filter_selector))
+        PACER.wait_turn(settle=False)
         remote_filter.click()
-        time.sleep(ACTION_DELAY)
+        WAITER.try_until(driver, "filter_refresh", network_idle(), 10)
 
         logging.info("Closing the filter menu...")
         # TODO: USER - Find a more reliable selector for the filter panel's close button.
         close_button_selector = (By.CSS_SELECTOR, "button[data-testid='undefined-close-button']") 
         # Example alternative: (By.XPATH, "//button[@aria-label='Close panel' or @aria-label='Close modal' or @aria-label='Close']")
         close_button = WebDriverWait(driver, 15).until(EC.element_to_be_clickable(close_button_selector))
+        PACER.wait_turn(settle=False)
         close_button.click()
         logging.info("Filters applied and panel closed successfully.")
 
+        logging.info("Waiting for filtered job list to refresh...")
+        if not WAITER.try_until(driver, "filtered_results", job_links_changed(unfiltered_hrefs), 10):
+            logging.info("Job list did not change after applying filters. Proceeding with the current list.")
+
     except TimeoutException:
         logging.warning("Could not find or click an element in the filter panel. Proceeding with applied filters or default.")
 
-    logging.info("Waiting for filtered job list to refresh...")
-    time.sleep(3)
-    page_number = 1
+def search_and_apply(driver, job_title, location, worksheet, worker_pool=None, job_index=None, search_mode=SEARCH_MODE_URL,
+                     start_page=1, start_position=0, on_progress=None, claim_job=None, listing_filter=None, recycler=None):
+    """Searches for jobs, applies filters, and processes listings, logging successes.
+
+    In SEARCH_MODE_URL the results pages are opened directly by URL and the next page is prefetched in a
+    background tab; in SEARCH_MODE_DASHBOARD the dashboard form, filter panel and 'Next' button are used.
+    With a worker_pool, job URLs are handed to the pool's browsers instead of being opened here.
+    With a job_index, jobs it already knows about are skipped and every outcome is recorded in it.
+    With a listing_filter, cards it rejects are skipped before their detail page is opened.
+    With a recycler (whose .driver is this driver), the browser is swapped for a fresh one between jobs
+    when it grows too large, and the walk carries on from the same results page and job.
+
+    Batch runs resume with start_page/start_position (jobs before it are skipped), get
+    on_progress(page, position) as the resume point advances, and pass claim_job(job_id), which
+    returns False for jobs another query of the batch already took.
+    The returned stats have "incomplete" set when a results page that should exist (one the previous
+    page linked to, or the page a resume starts from) did not load, so the query is not finished.
+    """
+    logging.info(f"Starting job search for '{job_title}' in '{location}' ({search_mode} mode).")
+    if start_page > 1 or start_position:
+        logging.info(f"Resuming at page {start_page}, job {start_position + 1}.")
+    with phase("search"):
+        if search_mode == SEARCH_MODE_URL:
+            PACER.wait_turn(settle=False)
+            driver.get(build_search_url(job_title, location, start_page))
+        else:
+            search_from_dashboard(driver, job_title, location) # Pages before start_page are walked without processing
+
+    page_number = start_page if search_mode == SEARCH_MODE_URL else 1
+    known_skipped = 0
+    duplicates_skipped = 0
+    filter_skipped = {}
+    cancelled = False
+    incomplete = False
+    blocked_requests = drain_blocked_request_count(driver) # Login, dashboard and search so far
+    results_window = driver.current_window_handle
+    detail_window = None # One reusable tab that job pages are navigated in, created on first use
+    prefetch_window = None # Background tab already loading the next results page (URL mode)
     while True:
         logging.info(f"--- Processing Page {page_number} ---")
-        job_links_selector = (By.CSS_SELECTOR, "a[data-testid='job-search-job-detail-link']")
-        try:
-            WebDriverWait(driver, 10).until(EC.presence_of_all_elements_located(job_links_selector)) # presence_of_all_elements_located
-        except TimeoutException:
-            logging.info("No more job links found or page did not load as expected. Ending process for this search.")
-            break 
-        job_elements = driver.find_elements(job_links_selector[0], job_links_selector[1]) 
-        job_count = len(job_elements)
+        with phase("page_load", page=page_number):
+            page_ready = WAITER.try_until(driver, "results_page", EC.presence_of_all_elements_located((By.CSS_SELECTOR, JOB_LINKS_CSS)), 10)
+            for _ in range(PACE_THROTTLE_RETRIES):
+                if page_ready or not driver.execute_script(PAGE_THROTTLED_JS):
+                    break
+                PACER.throttled(f"interstitial or captcha instead of results page {page_number}")
+                if search_mode != SEARCH_MODE_URL:
+                    break # Reloading would lose the dashboard's pagination state
+                PACER.wait_turn(phase_name="throttle_backoff")
+                driver.refresh()
+                page_ready = WAITER.try_until(driver, "results_page", EC.presence_of_all_elements_located((By.CSS_SELECTOR, JOB_LINKS_CSS)), 10)
+            listings = extract_job_listings(driver) if page_ready else []
+        if not page_ready:
+            if page_number > 1 or start_page > 1:
+                # Only page 1 can legitimately have no results; a later page was promised by the one before it
+                logging.warning(f"Results page {page_number} did not load. Stopping this search before it is finished.")
+                incomplete = True
+            else:
+                logging.info("No job links found on the first results page. Ending process for this search.")
+            break
+        blocked_requests += drain_blocked_request_count(driver)
+        results_url = driver.current_url
+        job_count = len(listings)
         logging.info(f"Found {job_count} jobs on this page. Starting application process...")
-        if job_count == 0:
-            logging.info("No jobs found on this page to process.")
-            # Check for "next" button even if no jobs, in case of empty intermediate pages
-            pass # Will proceed to "next page" check
-        original_window = driver.current_window_handle
-        for i in range(job_count):
-            job_name = "N/A"
+        if search_mode == SEARCH_MODE_URL and next_page_available(driver, job_count):
+            PACER.wait_turn(settle=False)
+            prefetch_window = open_background_tab(driver, build_search_url(job_title, location, page_number + 1))
+            driver.switch_to.window(results_window)
+        if page_number < start_page:
+            listings = []
+        elif page_number == start_page and start_position:
+            listings = [job for job in listings if job["position"] >= start_position]
+        candidate_count = len(listings)
+        if job_index:
+            new_listings = []
+            for job in listings:
+                known_outcome = job_index.skip_reason(job["id"])
+                if known_outcome:
+                    logging.info(f"Skipping known job '{job['title']}' (Page {page_number}): already recorded as {known_outcome}.")
+                    known_skipped += 1
+                    count_skip(SKIP_KNOWN)
+                else:
+                    new_listings.append(job)
+            listings = new_listings
+        if listing_filter:
+            listings, page_skipped = listing_filter.apply(listings)
+            for reason, count in page_skipped.items():
+                filter_skipped[reason] = filter_skipped.get(reason, 0) + count
+                count_skip(reason, count)
+            if page_skipped:
+                logging.info(f"Listing filters skipped {sum(page_skipped.values())} jobs on page {page_number}: {page_skipped}")
+        if claim_job:
+            claimed = [job for job in listings if claim_job(job["id"])]
+            duplicates_skipped += len(listings) - len(claimed)
+            count_skip(SKIP_DUPLICATE, len(listings) - len(claimed))
+            listings = claimed
+        emit_progress("page", query=f"{job_title} in {location}", page=page_number, listed=job_count,
+                      queued=len(listings), skipped=candidate_count - len(listings))
+        if worker_pool:
+            for job in listings:
+                worker_pool.submit(job["url"], job["title"], page_number)
+            logging.info(f"Queued {len(listings)} of {job_count} jobs from page {page_number} for {worker_pool.worker_count} workers ({worker_pool.pending()} pending).")
+            listings = [] # Workers open the jobs; this driver only walks the result pages
+            if on_progress:
+                # Resume from the oldest page that still has jobs in the workers' queue
+                on_progress(min(worker_pool.lowest_open_page() or page_number, page_number), 0)
+            if recycler and recycler.opened():
+                next_page_url = build_search_url(job_title, location, page_number + 1) if prefetch_window else None
+                driver, results_window, prefetch_window = recycle_search_browser(recycler, results_url, next_page_url)
+        for i, job in enumerate(listings):
+            if cancel_requested():
+                break
+            if detail_window is None:
+                driver.switch_to.new_window("tab")
+                block_resources_in_current_tab(driver)
+                detail_window = driver.current_window_handle
+            job_name = job["title"]
+            logging.info(f"--- Processing Job '{job_name}' ({i + 1} of {len(listings)}, Page {page_number}) ---")
             try:
-                all_jobs_on_page = WebDriverWait(driver, 10).until(EC.presence_of_all_elements_located(job_links_selector))
-                if i >= len(all_jobs_on_page):
-                    logging.warning("Job list changed during processing. Ending loop for this page.")
-                    break
-                current_job_link = all_jobs_on_page[i]
-                job_name = current_job_link.text or "N/A"
-                logging.info(f"--- Processing Job '{job_name}' ({i + 1} of {job_count}, Page {page_number}) ---")
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center', inline: 'nearest'});", current_job_link)
-                time.sleep(0.5)
-                current_job_link.click()
-                WebDriverWait(driver, 10).until(EC.number_of_windows_to_be(2))
-                for window_handle in driver.window_handles:
-                    if window_handle != original_window:
-                        driver.switch_to.window(window_handle)
-                        break
-                time.sleep(10) 
-                try:
-                    shadow_host = WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "apply-button-wc")))
-                    shadow_root = shadow_host.shadow_root
-                    easy_apply_button = shadow_root.find_element(By.CSS_SELECTOR, "button.btn.btn-primary")
-                    driver.execute_script("arguments[0].click();", easy_apply_button)
-                    next_button = WebDriverWait(driver, 15).until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.btn-next")))
-                    next_button.click()
-                    submit_button = WebDriverWait(driver, 15).until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.btn-next"))) 
-                    submit_button.click()
-                    logging.info(f"--- SUCCESS: Job '{job_name}' Submitted! ---")
+                PACER.wait_turn(settle=False)
+                with phase("job_open"):
+                    driver.switch_to.window(detail_window)
+                    driver.get(job["url"])
+                outcome = apply_to_job(driver, job_name)
+                blocked_requests += drain_blocked_request_count(driver)
+                count_job(outcome)
+                if job_index:
+                    job_index.record(job["id"], outcome, job_name, job["url"])
+                if outcome == OUTCOME_APPLIED:
                     log_to_google_sheet(worksheet, job_name)
-                    time.sleep(ACTION_DELAY)
-                except TimeoutException:
-                    logging.warning(f"Job '{job_name}' is not an 'Easy Apply' job or failed to load elements in apply flow. Skipping.")
-                finally:
-                    if len(driver.window_handles) > 1:
-                        driver.close()
-                    driver.switch_to.window(original_window)
-                    time.sleep(1)
-            except StaleElementReferenceException:
-                logging.error(f"Stale element error on job {i+1}. Page may have refreshed. Skipping.")
-                continue
+                    PACER.wait_turn()
             except Exception as e:
+                if isinstance(e, TimeoutException):
+                    PACER.throttled(f"job page '{job_name}' timed out")
                 logging.error(f"An unexpected error occurred on job '{job_name}': {e}")
                 logging.error(traceback.format_exc())
-                if driver.current_window_handle != original_window and len(driver.window_handles) > 1:
-                    driver.close()
-                    driver.switch_to.window(original_window)
-                continue
+                count_job(OUTCOME_ERROR)
+                if job_index:
+                    job_index.record(job["id"], OUTCOME_ERROR, job_name, job["url"])
+            if on_progress:
+                on_progress(page_number, job["position"] + 1)
+            if recycler and (recycler.opened() or not recycler.alive()):
+                next_page_url = build_search_url(job_title, location, page_number + 1) if prefetch_window else None
+                driver, results_window, prefetch_window = recycle_search_browser(recycler, results_url, next_page_url)
+                detail_window = None # Re-created in the new browser for the next job
+        driver.switch_to.window(results_window)
+        if cancel_requested():
+            logging.info("🛑 Run cancelled; stopped after the current job.")
+            cancelled = True
+            break
+        if on_progress and not worker_pool and page_number >= start_page:
+            on_progress(page_number + 1, 0)
+        if search_mode == SEARCH_MODE_URL:
+            if prefetch_window is None:
+                logging.info("This is the last page.")
+                logging.info("✅ All jobs across all pages have been processed. Bot is finished.")
+                break
+            driver.close() # Done with this results page; the next one has been loading in the background
+            results_window, prefetch_window = prefetch_window, None
+            driver.switch_to.window(results_window)
+            page_number += 1
+            continue
         try:
             logging.info("All jobs on this page processed. Looking for the 'Next' page button...")
-            next_page_button_xpath = "//span[@aria-label='Next']/ancestor::button[not(@disabled)]"
+            next_page_button_xpath = NEXT_PAGE_BUTTON_XPATH + "[not(@disabled)]"
             next_page_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, next_page_button_xpath)))
+            previous_hrefs = current_job_hrefs(driver)
+            PACER.wait_turn(settle=False)
             driver.execute_script("arguments[0].scrollIntoView({block: 'center', inline: 'nearest'});", next_page_button)
-            time.sleep(0.5)
             driver.execute_script("arguments[0].click();", next_page_button) # JS click for robustness
             logging.info("SUCCESS: Clicked 'Next' page. Waiting for new jobs to load...")
-            time.sleep(10)
+            if not WAITER.try_until(driver, "next_page", job_links_changed(previous_hrefs), 20):
+                logging.warning("Job list did not change after clicking 'Next'. Processing whatever is on the page.")
             page_number += 1
         except TimeoutException:
             logging.info("This is the last page. No 'Next' button found or it's disabled.")
@@ -303,125 +1446,1307 @@ def search_and_apply(driver, job_title, location, worksheet):
         except Exception as e:
             logging.error(f"Could not navigate to the next page due to an error: {e}")
             logging.error(traceback.format_exc())
+            incomplete = True
             break
+    for extra_window in (detail_window, prefetch_window):
+        if extra_window is not None:
+            driver.switch_to.window(extra_window)
+            driver.close()
+    driver.switch_to.window(results_window)
+    if job_index:
+        logging.info(f"Skipped {known_skipped} jobs already recorded in the job index.")
+    if claim_job:
+        logging.info(f"Skipped {duplicates_skipped} jobs already taken by another query of this batch.")
+    if listing_filter:
+        logging.info(f"Listing filters avoided {sum(filter_skipped.values())} detail page loads: {filter_skipped}")
+    if driver in _blocked_url_patterns:
+        logging.info(f"Blocked {blocked_requests} requests on this browser's pages.")
+    WAITER.log_stats()
+    if recycler:
+        logging.info(f"Browser recycled {recycler.recycles} times this search; peak process-tree memory {recycler.peak_rss_mb:.0f} MB.")
+    pace = PACER.stats()
+    logging.info(f"Pacing: {pace['delay']:.2f}s settle delay, {pace['throttle_events']} throttling signs so far, "
+                 f"{pace['actions_last_minute']}/{PACER.actions_per_minute} actions in the last minute.")
+    return {"pages": page_number, "known_skipped": known_skipped, "duplicates_skipped": duplicates_skipped,
+            "filter_skipped": filter_skipped, "blocked_requests": blocked_requests, "cancelled": cancelled,
+            "incomplete": incomplete}
 
 
-def start_bot_task(job_title, location, dice_email_ui, dice_password_ui, spreadsheet_id_ui, status_placeholder):
-    """Main bot task function"""
-    worksheet = None
+# --- RESOURCE BLOCKING CONFIGURATION ---
+# The bot only needs DOM nodes, so headless runs can skip everything below. Edit to taste.
+BLOCKING_PROFILE = {
+    "resource_types": ["image", "font", "media"], # Keys of RESOURCE_TYPE_URL_PATTERNS
+    "tracker_domains": [
+        "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+        "facebook.net", "connect.facebook.com", "hotjar.com", "clarity.ms", "segment.io", "segment.com",
+        "nr-data.net", "newrelic.com", "optimizely.com", "adsrvr.org", "quantserve.com",
+        "scorecardresearch.com", "demdex.net", "omtrdc.net", "bat.bing.com", "px.ads.linkedin.com",
+    ],
+    "extra_url_patterns": [], # Any other Network.setBlockedURLs patterns
+}
+RESOURCE_TYPE_URL_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.ico*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*"],
+}
+
+BLOCK_RESOURCES_DEFAULT = True # Initial state of the UI toggle
+
+# Blocked URL patterns per driver; new tabs need them applied again.
+_blocked_url_patterns = weakref.WeakKeyDictionary()
+
+def blocked_url_patterns(profile=BLOCKING_PROFILE):
+    """Expands a blocking profile into Network.setBlockedURLs patterns."""
+    patterns = []
+    for resource_type in profile["resource_types"]:
+        patterns.extend(RESOURCE_TYPE_URL_PATTERNS[resource_type])
+    patterns.extend(f"*{domain}/*" for domain in profile["tracker_domains"])
+    patterns.extend(profile["extra_url_patterns"])
+    return patterns
+
+def block_resources_in_current_tab(driver):
+    """Applies the driver's blocked URL patterns to the tab it is currently attached to (no-op if blocking is off)."""
+    patterns = _blocked_url_patterns.get(driver)
+    if not patterns:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+def drain_blocked_request_count(driver):
+    """Returns how many requests DevTools blocked since the last call, emptying the performance log."""
+    if driver not in _blocked_url_patterns:
+        return 0
+    blocked = 0
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message.get("method") == "Network.loadingFailed" and message.get("params", {}).get("blockedReason") == "inspector":
+            blocked += 1
+    return blocked
+
+# --- BROWSER SETUP ---
+def build_chrome_options(block_resources=False):
+    """Returns the headless Chromium options used for every browser session."""
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920x1080")
+    options.add_argument("--disable-features=VizDisplayCompositor")
+    options.add_argument("--disable-software-rasterizer")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--log-level=0")
+    options.add_argument("--disable-notifications")
+    # Keep background tabs (the prefetched results page) loading at full speed
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-backgrounding-occluded-windows")
+    options.add_argument("--disable-renderer-backgrounding")
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    if block_resources:
+        options.page_load_strategy = "eager" # Return once the DOM is parsed; don't wait for subresources
+        if "image" in BLOCKING_PROFILE["resource_types"]:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"}) # Source of the blocked-request counter
+    return options
+
+def create_driver(driver_path, block_resources=False):
+    """Starts a headless Chromium session using an already-resolved chromedriver path."""
+    driver = webdriver.Chrome(service=Service(driver_path), options=build_chrome_options(block_resources))
+    if block_resources:
+        _blocked_url_patterns[driver] = blocked_url_patterns()
+        block_resources_in_current_tab(driver)
+    return driver
+
+# --- DRIVER BINARY CACHE ---
+DRIVER_CACHE_PATH = os.path.join(DATA_DIR, "chromedriver_path.json")
+DRIVER_CACHE_TTL = 7 * 24 * 3600 # Re-resolve weekly; launch_browser() also re-resolves as soon as a Chromium update breaks it
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+def resolve_driver_path():
+    """Returns the chromedriver path, resolving it through ChromeDriverManager only when the on-disk cache is missing or stale."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+        try:
+            with open(DRIVER_CACHE_PATH, encoding="utf-8") as f:
+                cached = json.load(f)
+            if os.path.exists(cached["path"]) and time.time() - cached["resolved_at"] < DRIVER_CACHE_TTL:
+                _driver_path = cached["path"]
+                logging.info(f"Using cached chromedriver at {_driver_path}.")
+                return _driver_path
+        except (OSError, ValueError, KeyError):
+            pass
+        _driver_path = ChromeDriverManager(chrome_type=ChromeType.CHROMIUM).install()
+        os.makedirs(os.path.dirname(DRIVER_CACHE_PATH) or ".", exist_ok=True)
+        with open(DRIVER_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"path": _driver_path, "resolved_at": time.time()}, f)
+        logging.info(f"Resolved chromedriver at {_driver_path} and cached it.")
+        return _driver_path
+
+def forget_driver_path(stale_path):
+    """Drops a cached chromedriver path that no longer works, unless another thread has already replaced it."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path not in (None, stale_path):
+            return
+        _driver_path = None
+        try:
+            os.remove(DRIVER_CACHE_PATH)
+        except FileNotFoundError:
+            pass
+
+def launch_browser(block_resources=False):
+    """create_driver() with the resolved chromedriver, re-resolving it once if it no longer matches the installed Chromium."""
+    driver_path = resolve_driver_path()
     try:
-        status_placeholder.info("🔗 Connecting to Google Sheets...")
-        if "google_credentials" not in st.secrets: # This key must match your Streamlit secret
-            status_placeholder.error("❌ Google credentials not found in Streamlit Secrets. Please configure them in app settings.")
-            logging.error("Google credentials not found in Streamlit Secrets.")
+        return create_driver(driver_path, block_resources)
+    except SessionNotCreatedException as e:
+        logging.warning(f"Cached chromedriver could not start a session, probably after a Chromium update; resolving it again. ({e.msg})")
+        forget_driver_path(driver_path)
+        return create_driver(resolve_driver_path(), block_resources)
+
+# --- WARM BROWSER POOL ---
+BROWSER_POOL_MAX_IDLE = 4 # Idle browsers kept warm between runs; extras are quit on release
+BROWSER_POOL_IDLE_TTL = 15 * 60 # Idle browsers older than this are quit
+BROWSER_POOL_PREWARM = 1 # Browsers launched ahead of the first run
+BROWSER_POOL_JANITOR_INTERVAL = 60
+
+class BrowserPool:
+    """Process-level pool of launched Chromium sessions that runs lease and return instead of cold-starting.
+
+    Browsers are health-checked on lease, wiped (windows, cookies, storage) on release, and quit once
+    they have sat idle for longer than idle_ttl.
+    """
+
+    def __init__(self, block_resources=False, max_idle=BROWSER_POOL_MAX_IDLE, idle_ttl=BROWSER_POOL_IDLE_TTL):
+        self.block_resources = block_resources
+        self.max_idle = max_idle
+        self.idle_ttl = idle_ttl
+        self._idle = [] # (driver, returned_at)
+        self._closed = False
+        self._lock = threading.Lock()
+        threading.Thread(target=self._janitor, name="browser-pool-janitor", daemon=True).start()
+
+    def prewarm(self, count):
+        """Launches browsers in the background so the next lease doesn't pay the cold start."""
+        def launch():
+            for _ in range(count):
+                try:
+                    driver = launch_browser(self.block_resources)
+                except Exception as e:
+                    logging.warning(f"Could not prewarm a browser: {e}")
+                    return
+                self._park(driver)
+        threading.Thread(target=launch, name="browser-pool-prewarm", daemon=True).start()
+
+    def lease(self):
+        """Returns a healthy, clean browser: a warm one if available, otherwise a newly launched one."""
+        while True:
+            with self._lock:
+                driver = self._idle.pop()[0] if self._idle else None
+            if driver is None:
+                logging.info("No warm browser available; launching a new one.")
+                return launch_browser(self.block_resources)
+            if self._healthy(driver):
+                logging.info("Leased a warm browser from the pool.")
+                drain_blocked_request_count(driver) # Don't count another run's requests
+                return driver
+            logging.info("Discarding an unhealthy pooled browser.")
+            self._quit(driver)
+
+    def discard(self, driver):
+        """Quits a leased browser instead of returning it, e.g. one that has grown too large to keep."""
+        self._quit(driver)
+
+    def release(self, driver):
+        """Resets a browser and keeps it warm for the next run, or quits it if it is broken or the pool is full."""
+        if not (self._healthy(driver) and self._reset(driver)):
+            self._quit(driver)
             return
+        self._park(driver)
+
+    def _park(self, driver):
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append((driver, time.monotonic()))
+                return
+        self._quit(driver)
+
+    def evict_idle(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [d for d, returned_at in self._idle if now - returned_at > self.idle_ttl]
+            self._idle = [(d, t) for d, t in self._idle if now - t <= self.idle_ttl]
+        for driver in expired:
+            logging.info("Evicting a browser that sat idle too long.")
+            self._quit(driver)
+
+    def close(self):
+        """Quits every idle browser; browsers released or prewarmed afterwards are quit instead of kept."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver, _ in idle:
+            self._quit(driver)
+        if idle:
+            logging.info(f"Browser pool closed ({len(idle)} idle browsers quit).")
+
+    def _janitor(self):
+        while not self._closed:
+            time.sleep(BROWSER_POOL_JANITOR_INTERVAL)
+            self.evict_idle()
 
-        google_creds_dict = st.secrets["google_credentials"]
+    @staticmethod
+    def _healthy(driver):
+        try:
+            return driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver):
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.get("about:blank")
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": DICE_BASE_URL, "storageTypes": "all"})
+            return True
+        except Exception as e:
+            logging.warning(f"Could not reset a browser for reuse: {e}")
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Failed to quit a browser cleanly: {e}")
+
+@st.cache_resource
+def get_browser_pool(block_resources=False):
+    """The browser pool shared by every Streamlit session and run in this process (one per blocking setting)."""
+    pool = BrowserPool(block_resources)
+    pool.prewarm(BROWSER_POOL_PREWARM)
+    return pool
+
+# Fields accepted by the DevTools Network.setCookies command
+CDP_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+def export_session_cookies(driver):
+    """Returns every cookie in the browser (all domains) in a form Network.setCookies accepts."""
+    params = []
+    for cookie in driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]:
+        param = {key: cookie[key] for key in CDP_COOKIE_FIELDS if key in cookie}
+        if cookie.get("session"):
+            param.pop("expires", None)
+        params.append(param)
+    return params
+
+def import_session_cookies(driver, cookies):
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+    return len(cookies)
+
+def copy_session_cookies(source_driver, target_driver):
+    """Copies every cookie (all domains) from one browser session into another via DevTools."""
+    return import_session_cookies(target_driver, export_session_cookies(source_driver))
+
+# --- BROWSER RECYCLING ---
+RECYCLE_MAX_RSS_MB = 1500 # Replace a browser whose process tree holds more resident memory than this...
+RECYCLE_MAX_PAGES = 300 # ...or that has opened this many pages, whatever its memory reading
+RECYCLE_CHECK_EVERY = 10 # Pages between memory readings (and refreshes of the cookie snapshot)
+
+def browser_process_ids(driver):
+    """PIDs of the driver's chromedriver and every Chromium process started under it."""
+    root = driver.service.process.pid
+    if psutil:
+        try:
+            return [root] + [child.pid for child in psutil.Process(root).children(recursive=True)]
+        except psutil.Error:
+            return []
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as f:
+                stat = f.read()
+        except OSError:
+            continue # Exited while we were looking
+        parent = int(stat.rsplit(")", 1)[1].split()[1]) # Fields after "(comm)": state, ppid, ...
+        children.setdefault(parent, []).append(int(entry))
+    pids = []
+    pending = [root]
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending.extend(children.get(pid, ()))
+    return pids
+
+def browser_rss_bytes(driver):
+    """Resident memory of the browser's whole process tree, or None where it can't be measured."""
+    try:
+        pids = browser_process_ids(driver)
+    except (AttributeError, OSError):
+        return None # No local service process, or no /proc and no psutil
+    return sum(process_rss_bytes(pid) for pid in pids) or None
+
+def process_rss_bytes(pid):
+    """Resident memory of one process; 0 if it has exited."""
+    if psutil:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return 0
+    try:
+        with open(f"/proc/{pid}/statm", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+class BrowserRecycler:
+    """Watches one browser's page count and process-tree memory and swaps in a fresh browser past either limit.
+
+    The replacement is leased from the browser pool, gets the old browser's cookies (or the last snapshot of
+    them if the old browser has died) and reopens the page the caller asks for; the caller keeps its own
+    place in the job list. Callers use recycler.driver from then on.
+    """
+
+    def __init__(self, browser_pool, driver, max_rss_mb=RECYCLE_MAX_RSS_MB, max_pages=RECYCLE_MAX_PAGES):
+        self.browser_pool = browser_pool
+        self.driver = driver
+        self.max_rss_mb = max_rss_mb
+        self.max_pages = max_pages
+        self.pages = 0
+        self.recycles = 0
+        self.peak_rss_mb = 0.0
+        self._cookies = []
+        self.snapshot_cookies()
+
+    def snapshot_cookies(self):
+        """Keeps a copy of the session cookies for the case where the browser dies before it is recycled."""
+        try:
+            self._cookies = export_session_cookies(self.driver)
+        except Exception as e:
+            logging.warning(f"Could not snapshot browser cookies: {e}")
+
+    def alive(self):
+        return BrowserPool._healthy(self.driver)
+
+    def opened(self):
+        """Counts a page opened in this browser. Returns True when the browser is due for recycling."""
+        self.pages += 1
+        if self.max_pages and self.pages >= self.max_pages:
+            logging.info(f"Browser has opened {self.pages} pages; recycling it.")
+            return True
+        if self.pages % RECYCLE_CHECK_EVERY:
+            return False
+        self.snapshot_cookies()
+        rss = browser_rss_bytes(self.driver)
+        if rss is None:
+            return False
+        rss_mb = rss / (1024 * 1024)
+        self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+        if rss_mb > self.max_rss_mb:
+            logging.info(f"Browser process tree is at {rss_mb:.0f} MB (limit {self.max_rss_mb} MB) after {self.pages} pages; recycling it.")
+            return True
+        return False
+
+    def recycle(self, url=None):
+        """Replaces the browser with a fresh one carrying the same session, on url if given. Returns the new driver."""
+        with phase("browser_recycle", pages=self.pages):
+            self.snapshot_cookies()
+            self.browser_pool.discard(self.driver)
+            self.driver = self.browser_pool.lease()
+            import_session_cookies(self.driver, self._cookies)
+            if url:
+                PACER.wait_turn(settle=False)
+                self.driver.get(url)
+        self.recycles += 1
+        logging.info(f"Recycled the browser (#{self.recycles}) after {self.pages} pages; {len(self._cookies)} session cookies restored.")
+        self.pages = 0
+        return self.driver
+
+def recycle_search_browser(recycler, results_url, next_page_url=None):
+    """Recycles the search browser back onto its results page, re-opening the next-page prefetch tab if there was one.
+
+    Returns (driver, results_window, prefetch_window).
+    """
+    driver = recycler.recycle(results_url)
+    results_window = driver.current_window_handle
+    prefetch_window = None
+    if next_page_url:
+        PACER.wait_turn(settle=False)
+        prefetch_window = open_background_tab(driver, next_page_url)
+        driver.switch_to.window(results_window)
+    return driver, results_window, prefetch_window
+
+# --- PARALLEL WORKER POOL ---
+class JobWorkerPool:
+    """Headless browser sessions sharing the logged-in cookies that drain a queue of job URLs in parallel.
+
+    Workers only apply; every result goes back through a single collector thread, which is the only
+    place that writes to the worksheet.
+    """
+
+    def __init__(self, source_driver, browser_pool, worker_count, worksheet, job_index=None):
+        self.worker_count = worker_count
+        self.worksheet = worksheet
+        self.job_index = job_index
+        self.counts = dict.fromkeys(ALL_OUTCOMES, 0)
+        self.blocked_requests = 0
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._open_pages = {} # results page -> jobs from it not yet through the collector
+        self._open_pages_lock = threading.Lock()
+        self.browser_pool = browser_pool
+        self.metrics = current_run_metrics()
+        self._drivers = []
+        self._closed = False
+        try:
+            for n in range(worker_count):
+                worker_driver = browser_pool.lease()
+                self._drivers.append(worker_driver)
+                copied = copy_session_cookies(source_driver, worker_driver)
+                logging.info(f"Worker {n + 1}: browser ready with {copied} session cookies.")
+        except Exception:
+            for worker_driver in self._drivers:
+                browser_pool.release(worker_driver)
+            raise
+        self._workers = [
+            threading.Thread(target=self._work, args=(n + 1, d), name=f"job-worker-{n + 1}", daemon=True)
+            for n, d in enumerate(self._drivers)
+        ]
+        self._collector = threading.Thread(target=self._collect, name="job-result-collector", daemon=True)
+        for thread in self._workers:
+            thread.start()
+        self._collector.start()
+
+    def submit(self, job_url, job_name, page_number=None):
+        with self._open_pages_lock:
+            self._open_pages[page_number] = self._open_pages.get(page_number, 0) + 1
+        self._jobs.put((job_url, job_name, page_number))
+
+    def pending(self):
+        return self._jobs.qsize()
+
+    def lowest_open_page(self):
+        """The earliest results page that still has queued or in-progress jobs, or None."""
+        with self._open_pages_lock:
+            pages = [page for page in self._open_pages if page is not None]
+        return min(pages) if pages else None
+
+    def _work(self, worker_id, driver):
+        if self.metrics:
+            self.metrics.bind()
+        recycler = BrowserRecycler(self.browser_pool, driver)
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                break
+            job_url, job_name, page_number = item
+            if cancel_requested():
+                self._results.put((job_url, job_name, page_number, None, 0)) # Dropped unopened
+                continue
+            outcome = OUTCOME_ERROR
+            blocked = 0
+            try:
+                logging.info(f"--- Worker {worker_id}: Processing Job '{job_name}' ---")
+                PACER.wait_turn(settle=False)
+                with phase("job_open"):
+                    driver.get(job_url)
+                outcome = apply_to_job(driver, job_name)
+                blocked = drain_blocked_request_count(driver)
+            except Exception as e:
+                if isinstance(e, TimeoutException):
+                    PACER.throttled(f"job page '{job_name}' timed out")
+                logging.error(f"Worker {worker_id}: unexpected error on job '{job_name}': {e}")
+                logging.error(traceback.format_exc())
+            finally:
+                self._results.put((job_url, job_name, page_number, outcome, blocked))
+            if recycler.opened() or (outcome == OUTCOME_ERROR and not recycler.alive()):
+                try:
+                    driver = recycler.recycle()
+                    self._drivers[worker_id - 1] = driver
+                except Exception as e:
+                    logging.error(f"Worker {worker_id}: could not replace its browser: {e}")
+
+    def _collect(self):
+        if self.metrics:
+            self.metrics.bind()
+        while True:
+            item = self._results.get()
+            if item is None:
+                break
+            job_url, job_name, page_number, outcome, blocked = item
+            if outcome is None:
+                logging.info(f"Dropped queued job '{job_name}' because the run was cancelled.")
+            else:
+                self.counts[outcome] += 1
+                self.blocked_requests += blocked
+                count_job(outcome)
+                if self.job_index:
+                    self.job_index.record(extract_job_id(job_url), outcome, job_name, job_url)
+                if outcome == OUTCOME_APPLIED:
+                    log_to_google_sheet(self.worksheet, job_name)
+            with self._open_pages_lock:
+                self._open_pages[page_number] -= 1
+                if not self._open_pages[page_number]:
+                    del self._open_pages[page_number]
+
+    def close(self):
+        """Lets the workers finish every queued job, then stops the collector and quits the worker browsers."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._jobs.put(None)
+        for thread in self._workers:
+            thread.join()
+        self._results.put(None)
+        self._collector.join()
+        for worker_driver in self._drivers:
+            self.browser_pool.release(worker_driver)
+        logging.info(f"Worker pool closed ({self.worker_count} browsers returned to the browser pool).")
+
+_shared_sheet_writers = {} # spool path -> [SheetWriter, number of runs using it]
+_shared_sheet_writers_lock = threading.Lock()
+
+def connect_google_sheet(google_creds_dict, spreadsheet_id):
+    """Opens the first worksheet of a spreadsheet with service account credentials, wrapped in a SheetWriter.
+
+    Runs going at the same time share one writer per spreadsheet, since it owns the spreadsheet's spool file.
+    Give it back with release_google_sheet().
+    """
+    spool_path = os.path.join(SHEET_SPOOL_DIR, f"{spreadsheet_id}.jsonl")
+    with _shared_sheet_writers_lock:
+        shared = _shared_sheet_writers.get(spool_path)
+        if shared:
+            shared[1] += 1
+            shared[0].attach(current_run_metrics())
+            logging.info("Sharing the Google Sheets writer of a run already in progress.")
+            return shared[0]
         scoped_credentials = Credentials.from_service_account_info(
             google_creds_dict,
             scopes=['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
         )
         client = gspread.authorize(scoped_credentials)
-        spreadsheet = client.open_by_key(spreadsheet_id_ui) # Uses spreadsheet_id from UI
-        worksheet = spreadsheet.sheet1
-        logging.info("SUCCESS: Connected to Google Sheets.")
+        spreadsheet = client.open_by_key(spreadsheet_id)
+        worksheet = SheetWriter(spreadsheet.sheet1, spool_path)
+        _shared_sheet_writers[spool_path] = [worksheet, 1]
+    logging.info("SUCCESS: Connected to Google Sheets.")
+    return worksheet
+
+def release_google_sheet(worksheet):
+    """Closes a writer from connect_google_sheet once the last run using it is done with it."""
+    with _shared_sheet_writers_lock:
+        shared = _shared_sheet_writers[worksheet.spool_path]
+        shared[1] -= 1
+        if shared[1]:
+            worksheet.detach(current_run_metrics()) # Later batches belong to the runs still using it
+            return
+        del _shared_sheet_writers[worksheet.spool_path]
+    worksheet.close()
+    logging.info(f"Google Sheets writer closed ({worksheet.rows_written} rows written).")
+
+def open_dice_session(driver, dice_email, dice_password, status_placeholder):
+    """Reuses the saved Dice session for this account if it is still valid, otherwise logs in and saves it."""
+    status_placeholder.info("🔐 Checking for a saved Dice.com session...")
+    with phase("session_restore"):
+        session_restored = restore_dice_session(driver, dice_email)
+    if session_restored:
+        status_placeholder.success("✅ Reused saved Dice session! Navigating to search...")
+        return
+    status_placeholder.info("🔐 Logging in to Dice.com...")
+    with phase("login"):
+        login_to_dice(driver, dice_email, dice_password)
+    # login_to_dice will raise an exception if login fails fundamentally
+    save_dice_session(driver, dice_email)
+    status_placeholder.success("✅ Login successful! Navigating to search...")
+
+def start_bot_task(job_title, location, dice_email_ui, dice_password_ui, spreadsheet_id_ui, status_placeholder, worker_count=1,
+                   block_resources=BLOCK_RESOURCES_DEFAULT, search_mode=SEARCH_MODE_URL, google_creds_dict=None, control=None,
+                   listing_filter=None):
+    """Main bot task function. Returns the run metrics summary, or None if the run could not start.
+
+    Background runs pass google_creds_dict (Streamlit Secrets are read on the script thread) and their RunControl.
+    """
+    worksheet = None
+    metrics = RunMetrics(control=control)
+    metrics.bind()
+    try:
+        status_placeholder.info("🔗 Connecting to Google Sheets...")
+        if google_creds_dict is None:
+            if "google_credentials" not in st.secrets: # This key must match your Streamlit secret
+                status_placeholder.error("❌ Google credentials not found in Streamlit Secrets. Please configure them in app settings.")
+                logging.error("Google credentials not found in Streamlit Secrets.")
+                metrics.close()
+                metrics.unbind()
+                return
+            google_creds_dict = st.secrets["google_credentials"]
+
+        worksheet = connect_google_sheet(google_creds_dict, spreadsheet_id_ui) # Uses spreadsheet_id from UI
         status_placeholder.success("✅ Connected to Google Sheets successfully.")
 
     except Exception as e:
         logging.error(f"Failed to connect to Google Sheets: {e}")
         logging.error(traceback.format_exc())
         status_placeholder.error(f"❌ Error connecting to Google Sheets: {e}")
+        metrics.close()
+        metrics.unbind()
         return
 
     status_placeholder.info(f"🚀 Starting Bot for: {job_title} in {location} using Dice email: {dice_email_ui[:5]}...") # Mask email
     driver = None
+    recycler = None
+    worker_pool = None
+    job_index = JobIndex()
+    browser_pool = get_browser_pool(block_resources)
     try:
-        options = webdriver.ChromeOptions()
-        options.add_argument("--headless=new")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920x1080")
-        options.add_argument("--disable-features=VizDisplayCompositor")
-        options.add_argument("--disable-software-rasterizer")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--log-level=0")
-        options.add_argument("--disable-notifications")
-        options.add_experimental_option('excludeSwitches', ['enable-logging'])
-
         try:
-            service = Service(ChromeDriverManager(chrome_type=ChromeType.CHROMIUM).install())
-            driver = webdriver.Chrome(service=service, options=options)
+            with phase("driver_start"):
+                driver = browser_pool.lease()
         except Exception as e_driver:
             logging.error(f"Failed to initialize Chrome Driver: {e_driver}")
             status_placeholder.error(f"❌ Failed to initialize Chrome Driver: {e_driver}. Check logs.")
             return
 
-        status_placeholder.info("🔐 Logging in to Dice.com...")
-        login_to_dice(driver, dice_email_ui, dice_password_ui) # Pass UI credentials
-        
-        # login_to_dice will raise an exception if login fails fundamentally
-        status_placeholder.success("✅ Login successful! Navigating to search...")
-        
-        search_and_apply(driver, job_title, location, worksheet) # Call search_and_apply
+        open_dice_session(driver, dice_email_ui, dice_password_ui, status_placeholder) # Pass UI credentials
+        recycler = BrowserRecycler(browser_pool, driver)
+
+        if worker_count > 1:
+            status_placeholder.info(f"🧵 Starting {worker_count} parallel browser workers...")
+            with phase("driver_start", workers=worker_count):
+                worker_pool = JobWorkerPool(driver, browser_pool, worker_count, worksheet, job_index)
+
+        search_stats = search_and_apply(driver, job_title, location, worksheet, worker_pool, job_index, search_mode, # Call search_and_apply
+                                        listing_filter=listing_filter, recycler=recycler)
+        blocked_requests = search_stats["blocked_requests"]
 
-        status_placeholder.success("🎉 Bot has finished processing all pages.")
+        if worker_pool:
+            status_placeholder.info(f"⏳ Waiting for workers to finish {worker_pool.pending()} queued jobs...")
+            worker_pool.close()
+            logging.info(f"Worker pool results: {worker_pool.counts}")
+            blocked_requests += worker_pool.blocked_requests
+
+        if search_stats["cancelled"]:
+            status_placeholder.warning("🛑 Run cancelled after the current job.")
+        elif search_stats["incomplete"]:
+            status_placeholder.warning(f"⚠️ Results page {search_stats['pages']} did not load, so the search stopped early.")
+        elif block_resources:
+            logging.info(f"Resource blocking: {blocked_requests} requests blocked this run.")
+            status_placeholder.success(f"🎉 Bot has finished processing all pages. 🛡️ {blocked_requests} requests blocked.")
+        else:
+            status_placeholder.success("🎉 Bot has finished processing all pages.")
         logging.info("Process finished for all pages.")
     except Exception as e: # Catch exceptions from login_to_dice or search_and_apply
         status_placeholder.error(f"❌ A critical error occurred: {e}")
         logging.critical(f"A critical, unhandled error stopped the bot: {e}")
         logging.critical(traceback.format_exc())
     finally:
+        if worker_pool:
+            worker_pool.close()
+        if recycler:
+            driver = recycler.driver # The search browser may have been replaced mid-run
         if driver:
-            driver.quit()
-            logging.info("Browser closed.")
+            browser_pool.release(driver)
+            logging.info("Browser returned to the pool.")
+        release_google_sheet(worksheet)
+        job_index.close()
+        summary = metrics.close()
+        metrics.unbind()
+    return summary
 
-# --- Streamlit UI ---
-st.title("🤖 Dice.com Job Application Bot")
-st.markdown("---")
-
-st.subheader("🎯 Job Search Criteria")
-col1, col2 = st.columns(2)
-with col1:
-    job_title_ui = st.text_input("Enter job title:", placeholder="e.g., Software Engineer", key="job_title_ui")
-with col2:
-    location_ui = st.text_input("Enter location:", placeholder="e.g., New York, Remote", key="location_ui")
-
-st.markdown("---")
-st.subheader("🎲 Dice.com Credentials")
-col3, col4 = st.columns(2)
-with col3:
-    dice_email_ui_input = st.text_input("Dice Email:", placeholder="your.email@example.com", key="dice_email_ui")
-with col4:
-    dice_password_ui_input = st.text_input("Dice Password:", type="password", key="dice_password_ui")
-
-st.markdown("---")
-st.subheader("📊 Google Sheet Configuration")
-spreadsheet_id_ui_input = st.text_input("Google Spreadsheet ID:", value="1ML4bC7XVwQys-MR0TH8ujk5Fu3RtLxyUfJLC92Gzxqk", key="spreadsheet_id_ui")
-
-
-st.markdown("---")
-
-if st.button("🔍 Find and Apply for Jobs", type="primary", use_container_width=True):
-    if not (job_title_ui.strip() and location_ui.strip() and
-            dice_email_ui_input.strip() and dice_password_ui_input.strip() and
-            spreadsheet_id_ui_input.strip()):
-        st.error("❌ Please fill in all fields: Job Title, Location, Dice Email, Dice Password, and Spreadsheet ID.")
-    else:
-        status_placeholder = st.empty()
+# --- BATCH RUNS ---
+BATCH_CHECKPOINT_DIR = os.path.join(DATA_DIR, "checkpoints")
+BATCH_CHECKPOINT_SAVE_INTERVAL = 5.0 # Progress is written at most this often, and always when a query finishes
+BATCH_MAX_SESSIONS = 4 # Logged-in search browsers working through one batch's queries
+BATCH_STATUS_INTERVAL = 2.0
+
+def parse_batch_queries(text):
+    """Parses one 'job title | location' query per line into (title, location) pairs.
+
+    Blank lines and lines starting with '#' are ignored.
+    """
+    queries = []
+    for line_number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        job_title, separator, location = line.partition("|")
+        if not separator or not job_title.strip() or not location.strip():
+            raise ValueError(f"Line {line_number}: expected 'job title | location', got '{line}'.")
+        queries.append((job_title.strip(), location.strip()))
+    return queries
+
+class BatchCheckpoint:
+    """Resumable state of a batch run, kept in a JSON file next to the other local data.
+
+    Records which queries are finished, the (page, position) each unfinished query has reached, and which
+    query claimed each job id, so a job listed by several queries is only opened once per batch. Running
+    the same queries for the same account again picks the file up; it is removed once every query is done.
+    """
+
+    def __init__(self, queries, dice_email, path=None):
+        self.queries = [[job_title, location] for job_title, location in queries]
+        if path is None:
+            key = hashlib.sha256(json.dumps([dice_email.strip().lower(), self.queries]).encode("utf-8")).hexdigest()[:16]
+            path = os.path.join(BATCH_CHECKPOINT_DIR, f"batch-{key}.json")
+        self.path = path
+        self.done = set()
+        self.progress = {} # query index -> (page, position) to resume from
+        self.claims = {} # job id -> index of the query that took it
+        self.resumed = False
+        self._last_save = 0.0
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable batch checkpoint {path}: {e}")
+                return
+            if state.get("queries") != self.queries:
+                raise ValueError(f"Checkpoint {path} belongs to a different list of queries.")
+            self.done = set(state["done"])
+            self.progress = {int(index): tuple(point) for index, point in state["progress"].items()}
+            self.claims = state["claims"]
+            self.resumed = True
+            logging.info(f"Resuming batch from {path}: {len(self.done)}/{len(self.queries)} queries done, {len(self.claims)} jobs claimed.")
+
+    def pending_queries(self):
+        return [index for index in range(len(self.queries)) if index not in self.done]
+
+    def start_point(self, index):
+        return self.progress.get(index, (1, 0))
+
+    def claim(self, job_id, index):
+        """Returns True if the job is this query's to process, False if another query already took it."""
+        with self._lock:
+            return self.claims.setdefault(job_id, index) == index
+
+    def update(self, index, page_number, position):
+        with self._lock:
+            self.progress[index] = (page_number, position)
+        self.save(force=False)
+
+    def finish_query(self, index):
+        with self._lock:
+            self.done.add(index)
+            self.progress.pop(index, None)
+        self.save()
+
+    def save(self, force=True):
+        with self._lock:
+            if not force and time.monotonic() - self._last_save < BATCH_CHECKPOINT_SAVE_INTERVAL:
+                return
+            state = {
+                "queries": self.queries,
+                "done": sorted(self.done),
+                "progress": {str(index): list(point) for index, point in self.progress.items()},
+                "claims": self.claims,
+            }
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+            self._last_save = time.monotonic()
+
+    def complete(self):
+        """Deletes the checkpoint once every query has finished; returns whether it did."""
+        if self.pending_queries():
+            return False
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        return True
+
+def run_batch_session(recycler, query_queue, checkpoint, metrics, worksheet, job_index, browser_pool, worker_count,
+                      search_mode, listing_filter, failed_queries):
+    """Session thread of run_batch: takes query indices off the shared queue until it is empty.
+
+    The session's browser is recycler.driver, which may be replaced between jobs.
+    """
+    metrics.bind()
+    try:
+        while not cancel_requested():
+            try:
+                index = query_queue.get_nowait()
+            except queue.Empty:
+                return
+            job_title, location = checkpoint.queries[index]
+            start_page, start_position = checkpoint.start_point(index)
+            worker_pool = None
+            try:
+                if worker_count > 1:
+                    with phase("driver_start", workers=worker_count):
+                        worker_pool = JobWorkerPool(recycler.driver, browser_pool, worker_count, worksheet, job_index)
+                search_stats = search_and_apply(recycler.driver, job_title, location, worksheet, worker_pool, job_index, search_mode,
+                                                start_page, start_position,
+                                                on_progress=lambda page_number, position: checkpoint.update(index, page_number, position),
+                                                claim_job=lambda job_id: checkpoint.claim(job_id, index),
+                                                listing_filter=listing_filter, recycler=recycler)
+                if worker_pool:
+                    worker_pool.close()
+                    logging.info(f"Worker pool results for '{job_title}' in '{location}': {worker_pool.counts}")
+                if search_stats["cancelled"]:
+                    checkpoint.save()
+                    return
+                if search_stats["incomplete"]:
+                    failed_queries.append(index)
+                    checkpoint.save() # Keeps the query at the page that failed to load
+                    logging.warning(f"Batch query {index + 1} ('{job_title}' in '{location}') stopped at page {search_stats['pages']}.")
+                    continue
+                checkpoint.finish_query(index)
+                emit_progress("batch", done=len(checkpoint.done), total=len(checkpoint.queries))
+                logging.info(f"Batch query {index + 1} ('{job_title}' in '{location}') finished.")
+            except Exception as e:
+                failed_queries.append(index)
+                logging.error(f"Batch query {index + 1} ('{job_title}' in '{location}') stopped: {e}")
+                logging.error(traceback.format_exc())
+                checkpoint.save()
+            finally:
+                if worker_pool:
+                    worker_pool.close()
+    finally:
+        metrics.unbind()
+
+def batch_state(checkpoint, failed_queries=(), cancelled=False):
+    """Where a batch stands once run_batch returns; query numbers are 1-based, as in the log."""
+    return {
+        "queries": len(checkpoint.queries),
+        "pending": [index + 1 for index in checkpoint.pending_queries()],
+        "failed": sorted(index + 1 for index in failed_queries),
+        "cancelled": cancelled,
+    }
+
+_active_checkpoints = set() # Checkpoint files of batches running in this process
+_active_checkpoints_lock = threading.Lock()
+
+def run_batch(queries, dice_email, dice_password, google_creds_dict, spreadsheet_id, status_placeholder, sessions=1,
+              worker_count=1, block_resources=BLOCK_RESOURCES_DEFAULT, search_mode=SEARCH_MODE_URL, checkpoint_path=None,
+              control=None, listing_filter=None):
+    """Runs a list of (job_title, location) queries over one or more logged-in browser sessions.
+
+    The account logs in once and extra sessions get copies of its cookies. Sessions take queries from a
+    shared queue, so one that finishes early picks up the next query. Progress is checkpointed as jobs are
+    processed and an interrupted batch resumes from its checkpoint when run again.
+    Returns the run metrics summary with a "batch" entry (see batch_state()), only that entry if every
+    query was already done, or None if the batch could not start.
+    """
+    checkpoint = BatchCheckpoint(queries, dice_email, checkpoint_path)
+    pending = checkpoint.pending_queries()
+    if not pending:
+        checkpoint.complete()
+        status_placeholder.success("🎉 Every query in this batch has already been processed.")
+        return {"batch": batch_state(checkpoint)}
+    with _active_checkpoints_lock:
+        if checkpoint.path in _active_checkpoints:
+            status_placeholder.error("❌ This batch is already running.")
+            return None
+        _active_checkpoints.add(checkpoint.path)
+
+    metrics = RunMetrics(control=control)
+    metrics.bind()
+    try:
+        status_placeholder.info("🔗 Connecting to Google Sheets...")
+        worksheet = connect_google_sheet(google_creds_dict, spreadsheet_id)
+        status_placeholder.success("✅ Connected to Google Sheets successfully.")
+    except Exception as e:
+        logging.error(f"Failed to connect to Google Sheets: {e}")
+        logging.error(traceback.format_exc())
+        status_placeholder.error(f"❌ Error connecting to Google Sheets: {e}")
+        metrics.close()
+        metrics.unbind()
+        with _active_checkpoints_lock:
+            _active_checkpoints.discard(checkpoint.path)
+        return None
+
+    sessions = max(1, min(sessions, BATCH_MAX_SESSIONS, len(pending)))
+    resumed_note = f" (resuming, {len(checkpoint.done)} already done)" if checkpoint.resumed else ""
+    status_placeholder.info(f"🚀 Starting batch of {len(queries)} queries{resumed_note} on {sessions} session(s) using Dice email: {dice_email[:5]}...")
+    browser_pool = get_browser_pool(block_resources)
+    job_index = JobIndex()
+    recyclers = [] # One per session; each holds that session's current browser
+    failed_queries = []
+    cancelled = False
+    emit_progress("batch", done=len(checkpoint.done), total=len(queries))
+    try:
+        with phase("driver_start"):
+            driver = browser_pool.lease()
+        recyclers.append(BrowserRecycler(browser_pool, driver))
+        open_dice_session(driver, dice_email, dice_password, status_placeholder)
+        for _ in range(sessions - 1):
+            with phase("driver_start"):
+                session_driver = browser_pool.lease()
+            recyclers.append(BrowserRecycler(browser_pool, session_driver))
+            copy_session_cookies(driver, session_driver)
+        for recycler in recyclers:
+            recycler.snapshot_cookies() # Now that every session is logged in
+
+        query_queue = queue.Queue()
+        for index in pending:
+            query_queue.put(index)
+        threads = [
+            threading.Thread(target=run_batch_session, name=f"dice-batch-session-{number}", daemon=True,
+                             args=(recycler, query_queue, checkpoint, metrics, worksheet, job_index, browser_pool,
+                                   worker_count, search_mode, listing_filter, failed_queries))
+            for number, recycler in enumerate(recyclers)
+        ]
+        for thread in threads:
+            thread.start()
+        # Session threads never touch the status placeholder; progress is reported from here
+        running = threads
+        while running:
+            status_placeholder.info(f"📋 Batch: {len(checkpoint.done)}/{len(queries)} queries done, "
+                                    f"{sum(metrics.outcomes.values())} jobs processed on {sessions} session(s)...")
+            running[0].join(BATCH_STATUS_INTERVAL)
+            running = [thread for thread in threads if thread.is_alive()]
+
+        checkpoint.save()
+        cancelled = cancel_requested()
+        if cancelled:
+            status_placeholder.warning(f"🛑 Batch cancelled with {len(checkpoint.done)} of {len(queries)} queries done. "
+                                       "Run the same batch again to resume it from the checkpoint.")
+        elif failed_queries:
+            status_placeholder.warning(f"⚠️ {len(failed_queries)} of {len(queries)} queries stopped early. "
+                                       "Run the same batch again to resume them from the checkpoint.")
+        else:
+            checkpoint.complete()
+            status_placeholder.success(f"🎉 Batch finished: all {len(queries)} queries processed.")
+        logging.info(f"Batch finished; failed queries: {[index + 1 for index in failed_queries]}.")
+    except Exception as e:
+        checkpoint.save()
+        status_placeholder.error(f"❌ A critical error occurred: {e}")
+        logging.critical(f"A critical, unhandled error stopped the batch: {e}")
+        logging.critical(traceback.format_exc())
+    finally:
+        for recycler in recyclers:
+            browser_pool.release(recycler.driver)
+        release_google_sheet(worksheet)
+        job_index.close()
+        summary = metrics.close()
+        metrics.unbind()
+        with _active_checkpoints_lock:
+            _active_checkpoints.discard(checkpoint.path)
+    summary["batch"] = batch_state(checkpoint, failed_queries, cancelled)
+    return summary
+
+# --- BACKGROUND RUNS ---
+RUN_PROGRESS_REFRESH = 1.0 # Seconds between redraws of the live progress panel
+RUN_HISTORY_SIZE = 10 # Finished runs kept on screen until dismissed
+RUN_STATE_RUNNING = "running"
+RUN_STATE_FINISHED = "finished"
+RUN_STATE_CANCELLED = "cancelled"
+RUN_STATE_FAILED = "failed"
+
+class BotRun:
+    """A start_bot_task or run_batch call on its own thread, plus the progress the UI has seen from it.
+
+    The run reports through a RunControl; poll() folds its queued events into the counters that
+    render_bot_run() shows, so nothing on the run's threads ever touches Streamlit.
+    """
+
+    def __init__(self, label, target, *args, **kwargs):
+        self.run_id = os.urandom(4).hex()
+        self.label = label
+        self.control = RunControl()
+        self.state = RUN_STATE_RUNNING
+        self.summary = None
+        self.started = time.monotonic()
+        self.first_page_at = None
+        self.status = ("info", "⏳ Starting...")
+        self.query = None
+        self.page = None
+        self.discovered = 0 # Jobs from result pages that will be opened
+        self.skipped = 0 # Listings dropped before opening: already recorded or taken by another query
+        self.outcomes = dict.fromkeys(ALL_OUTCOMES, 0)
+        self.queries_done = None
+        self.queries_total = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, args=(target, args, kwargs), name=f"dice-run-{self.run_id}", daemon=True)
+        self._thread.start()
+
+    def _run(self, target, args, kwargs):
+        state = RUN_STATE_FINISHED
         try:
-            start_bot_task(
+            self.summary = target(*args, status_placeholder=RunStatus(self.control), control=self.control, **kwargs)
+            if self.control.cancelled:
+                state = RUN_STATE_CANCELLED
+        except Exception as e:
+            logging.critical(f"Background run '{self.label}' failed: {e}")
+            logging.critical(traceback.format_exc())
+            self.control.emit("status", level="error", message=f"❌ An error occurred during bot execution: {e}")
+            state = RUN_STATE_FAILED
+        self.control.emit("finished", state=state)
+
+    def cancel(self):
+        """Asks the run to stop after the job it is on; queued jobs and later pages are dropped."""
+        if self.state == RUN_STATE_RUNNING and not self.control.cancelled:
+            self.control.cancel()
+            self.control.emit("status", level="warning", message="🛑 Cancelling after the current job...")
+
+    def poll(self):
+        """Applies every event the run has sent since the last call."""
+        with self._lock:
+            while True:
+                try:
+                    event = self.control.events.get_nowait()
+                except queue.Empty:
+                    return
+                if event["type"] == "status":
+                    self.status = (event["level"], event["message"])
+                elif event["type"] == "page":
+                    self.first_page_at = self.first_page_at or event["time"]
+                    self.query, self.page = event["query"], event["page"]
+                    self.discovered += event["queued"]
+                    self.skipped += event["skipped"]
+                elif event["type"] == "job":
+                    self.outcomes[event["outcome"]] = self.outcomes.get(event["outcome"], 0) + 1
+                elif event["type"] == "batch":
+                    self.queries_done, self.queries_total = event["done"], event["total"]
+                elif event["type"] == "finished":
+                    self.state = event["state"]
+
+    @property
+    def processed(self):
+        return sum(self.outcomes.values())
+
+    def rate(self, *outcomes):
+        return sum(self.outcomes.get(outcome, 0) for outcome in outcomes) / self.processed if self.processed else 0.0
+
+    def eta_seconds(self):
+        """Time left for the jobs found so far at the rate since the first results page, or None."""
+        if not self.processed or self.first_page_at is None:
+            return None
+        jobs_per_second = self.processed / max(time.monotonic() - self.first_page_at, 1e-6)
+        return max(self.discovered - self.processed, 0) / jobs_per_second
+
+@st.cache_resource
+def get_run_registry():
+    """Background runs of this server process, newest first, shared by every browser tab."""
+    return []
+
+def launch_bot_run(label, target, *args, **kwargs):
+    """Starts target (start_bot_task or run_batch) on a background thread and lists it in the run registry."""
+    runs = get_run_registry()
+    run = BotRun(label, target, *args, **kwargs)
+    runs.insert(0, run)
+    finished = [old for old in runs if old.state != RUN_STATE_RUNNING]
+    for old in finished[RUN_HISTORY_SIZE:]:
+        runs.remove(old)
+    return run
+
+def dismiss_bot_run(run):
+    runs = get_run_registry()
+    if run in runs:
+        runs.remove(run)
+
+def render_bot_run(run):
+    """Live progress of one background run, its cancel button and, once it is over, its metrics report."""
+    run.poll()
+    state_icons = {RUN_STATE_RUNNING: "🏃", RUN_STATE_FINISHED: "✅", RUN_STATE_CANCELLED: "🛑", RUN_STATE_FAILED: "❌"}
+    st.markdown(f"**{state_icons[run.state]} {run.label}** · {run.state} · {(time.monotonic() - run.started) / 60:.1f} min")
+    level, message = run.status
+    getattr(st, level)(message)
+    if run.queries_total:
+        st.progress(run.queries_done / run.queries_total, text=f"Queries done: {run.queries_done} / {run.queries_total}")
+    col_page, col_jobs, col_applied, col_eta = st.columns(4)
+    col_page.metric("Page", run.page or "–", help=run.query)
+    col_jobs.metric("Jobs processed", f"{run.processed} / {run.discovered}")
+    col_applied.metric("Applied", run.outcomes[OUTCOME_APPLIED], f"{run.rate(OUTCOME_APPLIED):.0%} success", delta_color="off")
+    eta = run.eta_seconds() if run.state == RUN_STATE_RUNNING else None
+    col_eta.metric("ETA (jobs found so far)", f"{eta / 60:.1f} min" if eta is not None else "–")
+    skip_rate = run.skipped / (run.skipped + run.processed) if run.skipped + run.processed else 0.0
+    st.caption(f"Skipped before opening: {run.skipped} ({skip_rate:.0%}) · "
+               f"not Easy Apply / already applied: {run.rate(OUTCOME_NOT_EASY_APPLY, OUTCOME_EXTERNAL_APPLY, OUTCOME_ALREADY_APPLIED, OUTCOME_SCREENING_QUESTIONS):.0%} · "
+               f"errors: {run.rate(OUTCOME_ERROR, OUTCOME_PAGE_ERROR, OUTCOME_THROTTLED):.0%} · "
+               f"pacing: {PACER.delay:.1f}s delay, {PACER.throttle_events} throttling signs")
+    if run.state == RUN_STATE_RUNNING:
+        st.button("🛑 Cancel run", key=f"cancel_{run.run_id}", on_click=run.cancel, disabled=run.control.cancelled)
+        return
+    if run.summary and "phases" in run.summary: # A batch with nothing left to do has no metrics
+        with st.expander("📈 Run metrics"):
+            render_run_summary(run.summary)
+    st.button("Dismiss", key=f"dismiss_{run.run_id}", on_click=dismiss_bot_run, args=(run,))
+
+@st.fragment(run_every=RUN_PROGRESS_REFRESH)
+def render_bot_runs():
+    """Redraws every background run on a timer, without rerunning the rest of the page."""
+    runs = list(get_run_registry())
+    if not runs:
+        return
+    st.subheader("🏃 Runs")
+    for run in runs:
+        with st.container(border=True):
+            render_bot_run(run)
+
+def render_run_summary(summary):
+    """Shows a run's metrics summary: throughput, time split and per-phase latency."""
+    st.subheader("📈 Run Metrics")
+    col_jobs, col_rate, col_wall = st.columns(3)
+    col_jobs.metric("Jobs processed", summary["jobs"])
+    col_rate.metric("Jobs / minute", f"{summary['jobs_per_minute']:.1f}")
+    col_wall.metric("Run time", f"{summary['wall_seconds'] / 60:.1f} min")
+    col_sleep, col_wait, col_work = st.columns(3)
+    col_sleep.metric("Sleeping", f"{summary['sleeping_seconds']:.0f} s")
+    col_wait.metric("Waiting", f"{summary['waiting_seconds']:.0f} s")
+    col_work.metric("Working", f"{summary['working_seconds']:.0f} s")
+    st.caption("Outcomes: " + ", ".join(f"{name} {count}" for name, count in summary["outcomes"].items() if count))
+    if summary["skipped"]:
+        st.caption(f"Skipped before opening ({sum(summary['skipped'].values())} detail page loads avoided): "
+                   + ", ".join(f"{reason} {count}" for reason, count in summary["skipped"].items()))
+    st.dataframe(
+        [
+            {"phase": name, "count": p["count"], "p50 (s)": round(p["p50"], 2), "p95 (s)": round(p["p95"], 2), "total (s)": round(p["total"], 1)}
+            for name, p in sorted(summary["phases"].items(), key=lambda item: -item[1]["total"])
+        ],
+        use_container_width=True,
+    )
+    st.caption(f"Full span log: {os.path.join(RUN_METRICS_DIR, summary['run_id'] + '.jsonl')}")
+
+# --- Streamlit UI ---
+def render_app():
+    """The app page. Only drawn under `streamlit run`, so dice_batch.py, the benchmark and the tests can import this module."""
+    get_browser_pool(st.session_state.get("block_resources_ui", BLOCK_RESOURCES_DEFAULT)) # Start warming a browser while the form is being filled in
+
+    st.title("🤖 Dice.com Job Application Bot")
+    st.markdown("---")
+
+    st.subheader("🎯 Job Search Criteria")
+    col1, col2 = st.columns(2)
+    with col1:
+        job_title_ui = st.text_input("Enter job title:", placeholder="e.g., Software Engineer", key="job_title_ui")
+    with col2:
+        location_ui = st.text_input("Enter location:", placeholder="e.g., New York, Remote", key="location_ui")
+
+    with st.expander("🧹 Listing filters: skip jobs before opening them"):
+        col_include, col_exclude = st.columns(2)
+        include_keywords_ui = col_include.text_input("Title must contain one of:", placeholder="e.g., python, backend", key="include_keywords_ui")
+        exclude_keywords_ui = col_exclude.text_input("Skip titles containing:", placeholder="e.g., senior, manager", key="exclude_keywords_ui")
+        include_patterns_ui = col_include.text_area("Title must match one regex (one per line):", key="include_patterns_ui")
+        exclude_patterns_ui = col_exclude.text_area("Skip titles matching a regex (one per line):", key="exclude_patterns_ui")
+        company_blocklist_ui = st.text_input("Skip companies:", placeholder="e.g., Acme Staffing, Example Corp", key="company_blocklist_ui")
+        col_age, col_badge = st.columns(2)
+        max_age_days_ui = col_age.number_input("Max posting age (days):", min_value=0, value=None, step=1, placeholder="any", key="max_age_days_ui")
+        easy_apply_only_ui = col_badge.checkbox("Only cards showing an Easy Apply badge", key="easy_apply_only_ui")
+    try:
+        listing_filter_ui = ListingFilter(
+            include_keywords=split_rule_list(include_keywords_ui),
+            exclude_keywords=split_rule_list(exclude_keywords_ui),
+            include_patterns=split_rule_list(include_patterns_ui, "\n"),
+            exclude_patterns=split_rule_list(exclude_patterns_ui, "\n"),
+            company_blocklist=split_rule_list(company_blocklist_ui),
+            max_age_days=None if max_age_days_ui is None else int(max_age_days_ui),
+            easy_apply_only=easy_apply_only_ui,
+        )
+        listing_filter_error = None
+    except ValueError as e:
+        listing_filter_ui = None
+        listing_filter_error = f"❌ {e}"
+
+    st.markdown("---")
+    st.subheader("🎲 Dice.com Credentials")
+    col3, col4 = st.columns(2)
+    with col3:
+        dice_email_ui_input = st.text_input("Dice Email:", placeholder="your.email@example.com", key="dice_email_ui")
+    with col4:
+        dice_password_ui_input = st.text_input("Dice Password:", type="password", key="dice_password_ui")
+
+    st.markdown("---")
+    st.subheader("📊 Google Sheet Configuration")
+    spreadsheet_id_ui_input = st.text_input("Google Spreadsheet ID:", value="1ML4bC7XVwQys-MR0TH8ujk5Fu3RtLxyUfJLC92Gzxqk", key="spreadsheet_id_ui")
+
+    st.markdown("---")
+    st.subheader("⚙️ Performance")
+    worker_count_ui = st.number_input("Parallel browser workers:", min_value=1, max_value=MAX_WORKERS, value=1, step=1, key="worker_count_ui",
+                                      help="Number of headless browsers that open job pages at the same time. 1 = process jobs in the search browser.")
+    block_resources_ui = st.checkbox("Block images, fonts and trackers", value=BLOCK_RESOURCES_DEFAULT, key="block_resources_ui",
+                                     help="Blocks non-essential requests through Chromium DevTools and returns from page loads once the DOM is ready.")
+    actions_per_minute_ui = st.number_input("Browser actions per minute (all runs and sessions):", min_value=10, max_value=600, value=PACER.actions_per_minute, step=10,
+                                            key="actions_per_minute_ui", help="Page loads and clicks allowed per minute. Delays between actions also adapt to how fast Dice responds and back off on throttling.")
+    search_mode_ui = st.radio("Search mode:", [SEARCH_MODE_URL, SEARCH_MODE_DASHBOARD], horizontal=True, key="search_mode_ui",
+                              format_func=lambda mode: "Direct results URL (prefetch next page)" if mode == SEARCH_MODE_URL else "Dashboard form and filter panel")
+
+
+    st.markdown("---")
+
+    if st.button("🔍 Find and Apply for Jobs", type="primary", use_container_width=True):
+        if not (job_title_ui.strip() and location_ui.strip() and
+                dice_email_ui_input.strip() and dice_password_ui_input.strip() and
+                spreadsheet_id_ui_input.strip()):
+            st.error("❌ Please fill in all fields: Job Title, Location, Dice Email, Dice Password, and Spreadsheet ID.")
+        elif listing_filter_error:
+            st.error(listing_filter_error)
+        elif "google_credentials" not in st.secrets: # This key must match your Streamlit secret
+            st.error("❌ Google credentials not found in Streamlit Secrets. Please configure them in app settings.")
+        else:
+            PACER.actions_per_minute = int(actions_per_minute_ui) # Set on launch only; the budget is shared by every tab
+            launch_bot_run(
+                f"{job_title_ui.strip()} in {location_ui.strip()}",
+                start_bot_task,
                 job_title_ui.strip(),
                 location_ui.strip(),
                 dice_email_ui_input.strip(), # These are now taken from UI
                 dice_password_ui_input.strip(), # Password from UI
                 spreadsheet_id_ui_input.strip(), # Spreadsheet ID from UI
-                status_placeholder
+                worker_count=int(worker_count_ui),
+                block_resources=block_resources_ui,
+                search_mode=search_mode_ui,
+                google_creds_dict=st.secrets["google_credentials"], # Secrets are read here, on the script thread
+                listing_filter=listing_filter_ui
             )
-        except Exception as e: 
-            st.error(f"❌ An error occurred during bot execution: {str(e)}")
-            st.exception(e) # Shows full traceback in Streamlit UI
 
-# Footer
-st.markdown("---")
-st.markdown("Google Service Account credentials for Sheets are loaded securely from Streamlit Secrets.")
+    st.markdown("---")
+    with st.expander("📋 Batch Mode: several searches in one run"):
+        batch_queries_ui = st.text_area("Queries, one 'job title | location' per line:", key="batch_queries_ui",
+                                        placeholder="Software Engineer | Remote\nData Engineer | New York")
+        batch_sessions_ui = st.number_input("Logged-in search sessions:", min_value=1, max_value=BATCH_MAX_SESSIONS, value=1, step=1, key="batch_sessions_ui",
+                                            help="Search browsers working through the queries at once, each with the worker count above.")
+        st.caption("Jobs listed by several queries are only opened once. An interrupted batch resumes where it stopped when the same queries are run again.")
+        if st.button("📋 Run Batch", use_container_width=True):
+            try:
+                batch_queries = parse_batch_queries(batch_queries_ui)
+                batch_error = None
+            except ValueError as e:
+                batch_queries = []
+                batch_error = f"❌ Could not read the queries. {e}"
+            if batch_error:
+                st.error(batch_error)
+            elif not (batch_queries and dice_email_ui_input.strip() and dice_password_ui_input.strip() and spreadsheet_id_ui_input.strip()):
+                st.error("❌ Please enter at least one query and fill in Dice Email, Dice Password, and Spreadsheet ID.")
+            elif listing_filter_error:
+                st.error(listing_filter_error)
+            elif "google_credentials" not in st.secrets:
+                st.error("❌ Google credentials not found in Streamlit Secrets. Please configure them in app settings.")
+            else:
+                PACER.actions_per_minute = int(actions_per_minute_ui) # Set on launch only; the budget is shared by every tab
+                launch_bot_run(
+                    f"Batch of {len(batch_queries)} queries",
+                    run_batch,
+                    batch_queries,
+                    dice_email_ui_input.strip(),
+                    dice_password_ui_input.strip(),
+                    st.secrets["google_credentials"],
+                    spreadsheet_id_ui_input.strip(),
+                    sessions=int(batch_sessions_ui),
+                    worker_count=int(worker_count_ui),
+                    block_resources=block_resources_ui,
+                    search_mode=search_mode_ui,
+                    listing_filter=listing_filter_ui
+                )
+
+    render_bot_runs()
+
+    # Footer
+    st.markdown("---")
+    st.markdown("Google Service Account credentials for Sheets are loaded securely from Streamlit Secrets.")
+
+if st.runtime.exists():
+    render_app()
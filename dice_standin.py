@@ -0,0 +1,301 @@
+import argparse
+import hashlib
+import html
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, urlencode
+
+# A local stand-in for the parts of dice.com that dice_bot.py depends on: the two-step login with the
+# cookie banner, the dashboard search form, results pages with job-search-job-detail-link cards and the
+# 'Next' button, job detail pages with the apply-button-wc shadow root, and the btn-next apply wizard.
+# Run it directly, or use start_standin_server() from a benchmark.
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+SESSION_COOKIE = "standin_session"
+
+# --- STAND-IN CONFIGURATION ---
+DEFAULT_CONFIG = {
+    "pages": 3, # Results pages before 'Next' is disabled
+    "jobs_per_page": 20,
+    "latency": 0.05, # Seconds added to every response...
+    "latency_jitter": 0.05, # ...plus up to this much at random
+    "render_delay_ms": 150, # How long apply-button-wc takes to render its shadow root
+    "failure_rate": 0.0, # Share of job detail pages answered with a 500 error page
+    # Share of jobs of each kind; whatever is left over is plain Easy Apply
+    "external_rate": 0.15,
+    "already_applied_rate": 0.05,
+    "questions_rate": 0.05,
+    "no_button_rate": 0.05,
+    "seed": 12,
+}
+
+JOB_KINDS = ("easy-apply", "external-apply", "already-applied", "screening-questions", "no-apply-button")
+
+def job_kind(config, job_id):
+    """Deterministic kind for a job ID, so every run over the same config sees the same site."""
+    roll = int(hashlib.sha256(f"{config['seed']}:{job_id}".encode()).hexdigest()[:8], 16) / 0xFFFFFFFF
+    for kind, rate_key in (("external-apply", "external_rate"), ("already-applied", "already_applied_rate"),
+                           ("screening-questions", "questions_rate"), ("no-apply-button", "no_button_rate")):
+        if roll < config[rate_key]:
+            return kind
+        roll -= config[rate_key]
+    return "easy-apply"
+
+def job_id_for(page_number, index):
+    return f"standin-{page_number:03d}-{index:03d}"
+
+def expected_kinds(config):
+    """Counts of each job kind across every results page, for checking a benchmark's outcomes."""
+    counts = dict.fromkeys(JOB_KINDS, 0)
+    for page_number in range(1, config["pages"] + 1):
+        for index in range(config["jobs_per_page"]):
+            counts[job_kind(config, job_id_for(page_number, index))] += 1
+    return counts
+
+# --- PAGES ---
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+{body}
+</body></html>"""
+
+COOKIE_BANNER = """<div id="cmpwrapper" style="position:fixed;bottom:0;left:0;right:0;padding:16px;background:#eee">
+  We use cookies. <button id="onetrust-accept-btn-handler" onclick="document.getElementById('cmpwrapper').style.display='none'">Accept All</button>
+</div>"""
+
+LOGIN_BODY = """<h1>Sign in</h1>
+<form method="post" action="/dashboard/login">
+  <div id="email-step">
+    <input name="email" type="email">
+    <button type="button" data-testid="sign-in-button"
+            onclick="document.getElementById('email-step').style.display='none';document.getElementById('password-step').style.display='block'">Continue</button>
+  </div>
+  <div id="password-step" style="display:none">
+    <input name="password" type="password">
+    <button type="submit">Sign In</button>
+  </div>
+</form>
+""" + COOKIE_BANNER
+
+SEARCH_BAR = """<form onsubmit="return false">
+  <input name="q" value="{q}">
+  <input name="location" value="{location}">
+  <button data-testid="job-search-search-bar-search-button"
+          onclick="location.href='/jobs?' + new URLSearchParams({{q: document.getElementsByName('q')[0].value, location: document.getElementsByName('location')[0].value}})">Search</button>
+</form>"""
+
+DASHBOARD_BODY = """<div data-testid="header-user-menu">Stand-in User</div>
+<h1>Recommended For You</h1>
+""" + SEARCH_BAR
+
+FILTER_PANEL = """<button onclick="document.getElementById('filters').style.display='block'">All filters</button>
+<div id="filters" style="display:none">
+  <label><input type="checkbox" name="easyApply"> Easy apply</label>
+  <label><input type="checkbox" name="remote"> Remote</label>
+  <button data-testid="undefined-close-button" onclick="document.getElementById('filters').style.display='none'">Close</button>
+</div>"""
+
+JOB_CARD = """<div data-testid="job-card">
+  <a data-testid="job-search-job-detail-link" href="/job-detail/{job_id}" target="_blank">{title}</a>
+  <span data-testid="company-name">{company}</span>
+  <span>Posted {age} days ago</span>
+  {badge}
+</div>"""
+
+APPLY_BUTTON_SCRIPT = """<script>
+customElements.define('apply-button-wc', class extends HTMLElement {
+  connectedCallback() {
+    const root = this.attachShadow({mode: 'open'});
+    const kind = this.getAttribute('kind');
+    const jobId = this.getAttribute('job-id');
+    setTimeout(() => {
+      if (kind === 'already-applied') {
+        root.innerHTML = '<span class="applied">Applied</span>';
+      } else if (kind === 'external-apply') {
+        root.innerHTML = '<a class="btn btn-primary" href="https://example.com/careers">Apply Now</a>';
+      } else {
+        root.innerHTML = '<button class="btn btn-primary">Easy apply</button>';
+        root.querySelector('button').addEventListener('click', () => {
+          location.href = '/job-applications/' + jobId + '/wizard?step=1';
+        });
+      }
+    }, %d);
+  }
+});
+</script>"""
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config):
+        super().__init__(address, StandinHandler)
+        self.config = config
+        self.stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "failures_injected": 0, "applications": 0, "logins": 0}
+        self.applied_job_ids = set()
+        self._random = random.Random(config["seed"])
+
+    def count(self, key, amount=1):
+        with self.stats_lock:
+            self.stats[key] += amount
+
+    def should_fail(self):
+        with self.stats_lock:
+            return self._random.random() < self.config["failure_rate"]
+
+    def response_delay(self):
+        with self.stats_lock:
+            jitter = self._random.random() * self.config["latency_jitter"]
+        return self.config["latency"] + jitter
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "DiceStandin/1.0"
+
+    def log_message(self, format, *args):
+        logging.debug("standin: " + format % args)
+
+    def _send_page(self, title, body, status=200, headers=None):
+        content = PAGE_TEMPLATE.format(title=html.escape(title), body=body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _redirect(self, location, headers=None):
+        self.send_response(303)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _logged_in(self):
+        return f"{SESSION_COOKIE}=" in (self.headers.get("Cookie") or "")
+
+    def _begin(self):
+        self.server.count("requests")
+        time.sleep(self.server.response_delay())
+        url = urlparse(self.path)
+        return url.path.rstrip("/") or "/", {key: values[0] for key, values in parse_qs(url.query).items()}
+
+    def do_POST(self):
+        path, _ = self._begin()
+        if path == "/dashboard/login":
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self.server.count("logins")
+            self._redirect("/dashboard", {"Set-Cookie": f"{SESSION_COOKIE}={int(time.time())}; Path=/; HttpOnly"})
+        else:
+            self._send_page("Not found", "<h1>Page not found</h1>", status=404)
+
+    def do_GET(self):
+        path, query = self._begin()
+        if path == "/dashboard/login":
+            self._send_page("Sign in", LOGIN_BODY)
+        elif not self._logged_in():
+            self._redirect("/dashboard/login")
+        elif path == "/dashboard":
+            self._send_page("Dashboard", DASHBOARD_BODY.format(q="", location=""))
+        elif path == "/jobs":
+            self._results_page(query)
+        elif path.startswith("/job-detail/"):
+            self._detail_page(path.rsplit("/", 1)[-1])
+        elif path.startswith("/job-applications/") and path.endswith("/wizard"):
+            self._wizard_page(path.split("/")[2], query.get("step", "1"))
+        elif path.startswith("/job-applications/") and path.endswith("/submitted"):
+            job_id = path.split("/")[2]
+            with self.server.stats_lock:
+                if job_id not in self.server.applied_job_ids:
+                    self.server.applied_job_ids.add(job_id)
+                    self.server.stats["applications"] += 1
+            self._send_page("Application submitted", "<h1>Application submitted</h1><p>Thank you for applying.</p>")
+        else:
+            self._send_page("Not found", "<h1>Page not found</h1>", status=404)
+
+    def _results_page(self, query):
+        config = self.server.config
+        page_number = int(query.get("page", "1"))
+        cards = []
+        if page_number <= config["pages"]:
+            for index in range(config["jobs_per_page"]):
+                job_id = job_id_for(page_number, index)
+                cards.append(JOB_CARD.format(
+                    job_id=job_id,
+                    title=f"Stand-in Engineer {page_number}.{index}",
+                    company=f"Company {index % 7}",
+                    age=(page_number + index) % 30,
+                    badge="<span>Easy Apply</span>" if job_kind(config, job_id) != "external-apply" else "",
+                ))
+        next_query = urlencode({**query, "page": page_number + 1})
+        disabled = "" if page_number < config["pages"] else "disabled"
+        body = (
+            SEARCH_BAR.format(q=html.escape(query.get("q", "")), location=html.escape(query.get("location", "")))
+            + FILTER_PANEL
+            + f"<div id='results'>{''.join(cards)}</div>"
+            + f"<nav><button {disabled} onclick=\"location.href='/jobs?{html.escape(next_query)}'\"><span aria-label=\"Next\">&rsaquo;</span></button></nav>"
+        )
+        self._send_page(f"Jobs - page {page_number}", body)
+
+    def _detail_page(self, job_id):
+        if self.server.should_fail():
+            self.server.count("failures_injected")
+            self._send_page("Error", "<h1>Something went wrong</h1>", status=500)
+            return
+        kind = job_kind(self.server.config, job_id)
+        host = "" if kind == "no-apply-button" else f'<apply-button-wc kind="{kind}" job-id="{job_id}"></apply-button-wc>'
+        body = (
+            f"<h1>Job {html.escape(job_id)}</h1>{host}<p>Stand-in job description.</p>"
+            + APPLY_BUTTON_SCRIPT % self.server.config["render_delay_ms"]
+        )
+        self._send_page(f"Job {job_id}", body)
+
+    def _wizard_page(self, job_id, step):
+        kind = job_kind(self.server.config, job_id)
+        if step == "1":
+            question = '<label>Years of experience <input name="years" required></label>' if kind == "screening-questions" else ""
+            body = (f"<h2>Contact info</h2><input name='phone' value='555-0100'>{question}"
+                    f"<button class='btn-next' onclick=\"location.href='/job-applications/{job_id}/wizard?step=2'\">Next</button>")
+        else:
+            body = (f"<h2>Review your application</h2>"
+                    f"<button class='btn-next' onclick=\"location.href='/job-applications/{job_id}/submitted'\">Submit</button>")
+        self._send_page("Apply", body)
+
+
+def start_standin_server(config=None, host="127.0.0.1", port=0):
+    """Starts the stand-in site on a background thread. Returns (server, base_url)."""
+    server = StandinServer((host, port), {**DEFAULT_CONFIG, **(config or {})})
+    threading.Thread(target=server.serve_forever, name="dice-standin", daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    logging.info(f"Dice stand-in serving at {base_url} with {json.dumps(server.config)}")
+    return server, base_url
+
+
+def parse_config_args(parser):
+    """Adds one --option per DEFAULT_CONFIG entry to an argparse parser."""
+    for key, value in DEFAULT_CONFIG.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value, dest=key)
+    return parser
+
+
+if __name__ == "__main__":
+    parser = parse_config_args(argparse.ArgumentParser(description="Serve a local stand-in for the dice.com pages the bot uses."))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+    server, base_url = start_standin_server(args, host, port)
+    print(f"Run the bot against it with DICE_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,7 @@
+import os
+import sys
+import tempfile
+
+# dice_bot reads DICE_BOT_DATA_DIR at import time; keep the spools, indexes and run logs of the tests out of the repo
+os.environ.setdefault("DICE_BOT_DATA_DIR", tempfile.mkdtemp(prefix="dice-bot-tests-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
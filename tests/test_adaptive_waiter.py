@@ -0,0 +1,69 @@
+import pytest
+
+import dice_bot
+
+
+class FakeDriver:
+    pass
+
+
+class TimingOutWait:
+    """Stands in for WebDriverWait on a page that never gets ready; remembers the timeouts it was given."""
+
+    timeouts = []
+
+    def __init__(self, driver, timeout, poll_frequency=None):
+        self.timeouts.append(timeout)
+
+    def until(self, condition):
+        raise dice_bot.TimeoutException()
+
+
+@pytest.fixture
+def waiter():
+    return dice_bot.AdaptiveWaiter()
+
+
+def seed(waiter, step, samples):
+    for sample in samples:
+        waiter._samples.setdefault(step, dice_bot.deque(maxlen=dice_bot.WAIT_HISTORY_SIZE)).append(sample)
+
+
+def test_the_default_applies_until_there_are_enough_samples(waiter):
+    seed(waiter, "step", [0.1] * (dice_bot.WAIT_MIN_SAMPLES - 1))
+    assert waiter.timeout_for("step", 7) == 7
+    seed(waiter, "step", [0.1])
+    assert waiter.timeout_for("step", 7) != 7
+
+
+@pytest.mark.parametrize("samples, expected", [
+    ([1.5] * 10, 1.5 * dice_bot.WAIT_TIMEOUT_MULTIPLIER),
+    ([0.1] * 10, dice_bot.WAIT_MIN_TIMEOUT),
+    ([float(n) for n in range(1, 21)], dice_bot.WAIT_MAX_TIMEOUT),
+])
+def test_the_timeout_is_a_clamped_multiple_of_the_p95(waiter, samples, expected):
+    seed(waiter, "step", samples)
+    assert waiter.timeout_for("step", 7) == pytest.approx(expected)
+
+
+def test_a_successful_wait_is_recorded(waiter):
+    assert waiter.until(FakeDriver(), "step", lambda driver: "ready", 7) == "ready"
+    stats = waiter.stats()["step"]
+    assert stats["count"] == 1
+    assert stats["timeouts"] == 0
+    assert stats["p50"] < 1
+
+
+def test_timeouts_widen_the_next_timeout(waiter, monkeypatch):
+    monkeypatch.setattr(dice_bot, "WebDriverWait", TimingOutWait)
+    monkeypatch.setattr(TimingOutWait, "timeouts", [])
+    seed(waiter, "step", [0.1] * 10)
+    for _ in range(5):
+        assert waiter.try_until(FakeDriver(), "step", lambda driver: False, 7) is None
+    first = dice_bot.WAIT_MIN_TIMEOUT
+    second = first * dice_bot.WAIT_TIMEOUT_MULTIPLIER
+    third = second * dice_bot.WAIT_TIMEOUT_MULTIPLIER
+    # Each miss is sampled at its timeout, so once misses pass 5% of the history the p95 climbs to them
+    assert TimingOutWait.timeouts == [first, first, second, second, third]
+    assert waiter.stats()["step"]["timeouts"] == 5
+    assert waiter.timeout_for("step", 7) == third
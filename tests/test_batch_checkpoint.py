@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+import dice_bot
+
+QUERIES = [("Data Engineer", "Remote"), ("SRE", "Austin, TX"), ("Backend Engineer", "New York")]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "batch.json")
+
+
+def test_a_new_batch_starts_every_query_from_the_top(path):
+    checkpoint = dice_bot.BatchCheckpoint(QUERIES, "me@example.com", path)
+    assert not checkpoint.resumed
+    assert checkpoint.pending_queries() == [0, 1, 2]
+    assert checkpoint.start_point(1) == (1, 0)
+
+
+def test_an_interrupted_batch_resumes_where_it_stopped(path):
+    checkpoint = dice_bot.BatchCheckpoint(QUERIES, "me@example.com", path)
+    checkpoint.finish_query(0)
+    checkpoint.update(1, 3, 7)
+    assert checkpoint.claim("job-1", 1)
+    checkpoint.save()
+
+    resumed = dice_bot.BatchCheckpoint(QUERIES, "me@example.com", path)
+    assert resumed.resumed
+    assert resumed.pending_queries() == [1, 2]
+    assert resumed.start_point(1) == (3, 7)
+    assert resumed.start_point(2) == (1, 0)
+    assert not resumed.claim("job-1", 2) # Still taken by query 1
+    assert resumed.claim("job-1", 1)
+
+
+def test_a_checkpoint_for_other_queries_is_refused(path):
+    dice_bot.BatchCheckpoint(QUERIES, "me@example.com", path).save()
+    with pytest.raises(ValueError):
+        dice_bot.BatchCheckpoint(QUERIES[:2], "me@example.com", path)
+
+
+def test_complete_removes_the_file_only_when_every_query_is_done(path):
+    checkpoint = dice_bot.BatchCheckpoint(QUERIES, "me@example.com", path)
+    checkpoint.finish_query(0)
+    checkpoint.finish_query(1)
+    assert not checkpoint.complete()
+    assert os.path.exists(path)
+    checkpoint.finish_query(2)
+    assert checkpoint.complete()
+    assert not os.path.exists(path)
+    assert dice_bot.BatchCheckpoint(QUERIES, "me@example.com", path).pending_queries() == [0, 1, 2]
+
+
+def test_the_default_path_depends_on_the_account_and_the_queries():
+    path = dice_bot.BatchCheckpoint(QUERIES, "Me@Example.com ").path
+    assert dice_bot.BatchCheckpoint(QUERIES, "me@example.com").path == path
+    assert dice_bot.BatchCheckpoint(QUERIES, "other@example.com").path != path
+    assert dice_bot.BatchCheckpoint(QUERIES[:2], "me@example.com").path != path
+
+
+def test_run_batch_reports_a_batch_that_is_already_done(path):
+    checkpoint = dice_bot.BatchCheckpoint(QUERIES, "me@example.com", path)
+    for index in range(len(QUERIES)):
+        checkpoint.finish_query(index)
+
+    class Status:
+        def __getattr__(self, level):
+            return lambda message: None
+
+    result = dice_bot.run_batch(QUERIES, "me@example.com", "password", {}, "sheet-id", Status(), checkpoint_path=path)
+    assert result == {"batch": {"queries": 3, "pending": [], "failed": [], "cancelled": False}}
+    assert not os.path.exists(path)
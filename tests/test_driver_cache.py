@@ -0,0 +1,48 @@
+import pytest
+
+import dice_bot
+
+
+@pytest.fixture
+def installs(tmp_path, monkeypatch):
+    """Fakes ChromeDriverManager: each install() 'downloads' a new chromedriver file and returns its path."""
+    paths = []
+
+    class FakeManager:
+        def __init__(self, chrome_type=None):
+            pass
+
+        def install(self):
+            path = tmp_path / f"chromedriver-{len(paths) + 1}"
+            path.write_text("")
+            paths.append(str(path))
+            return str(path)
+
+    monkeypatch.setattr(dice_bot, "ChromeDriverManager", FakeManager)
+    monkeypatch.setattr(dice_bot, "DRIVER_CACHE_PATH", str(tmp_path / "cache" / "chromedriver_path.json"))
+    monkeypatch.setattr(dice_bot, "_driver_path", None)
+    return paths
+
+
+def test_the_resolved_path_is_cached_on_disk(installs, monkeypatch):
+    path = dice_bot.resolve_driver_path()
+    monkeypatch.setattr(dice_bot, "_driver_path", None) # As in a new process
+    assert dice_bot.resolve_driver_path() == path
+    assert installs == [path]
+
+
+def test_a_driver_that_no_longer_matches_chromium_is_resolved_again(installs, monkeypatch):
+    stale = dice_bot.resolve_driver_path()
+    started = []
+
+    def create_driver(driver_path, block_resources=False):
+        if driver_path == stale:
+            raise dice_bot.SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 1")
+        started.append(driver_path)
+        return object()
+
+    monkeypatch.setattr(dice_bot, "create_driver", create_driver)
+    dice_bot.launch_browser()
+    assert started == [installs[1]]
+    monkeypatch.setattr(dice_bot, "_driver_path", None)
+    assert dice_bot.resolve_driver_path() == installs[1] # The cache now holds the new driver
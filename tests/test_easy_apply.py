@@ -0,0 +1,68 @@
+import pytest
+
+import dice_bot
+
+
+class FakeButton:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def click(self):
+        self.driver.page += 1
+
+
+class WizardDriver:
+    """A job tab whose detail page takes a few polls to unload after Easy Apply, then shows the wizard pages.
+
+    pages holds what WIZARD_PROBE_JS returns on each wizard page; the detail page itself probes as an error,
+    like a page with an alert on it.
+    """
+
+    current_url = "https://www.dice.com/job-detail/job-1"
+
+    def __init__(self, pages, unload_polls=2):
+        self.pages = pages
+        self.page = 0
+        self.clicked = False
+        self.unload_polls = unload_polls
+        self.probes = []
+
+    def execute_script(self, script, *args):
+        if "__diceBotDetailPage = true" in script:
+            self.clicked = True
+            return None
+        if script == dice_bot.WIZARD_PROBE_JS:
+            left = self.clicked and not self.unload_polls
+            self.probes.append(left)
+            return self.pages[self.page] if left else {"state": "error"}
+        if "__diceBotDetailPage" in script: # left_detail_page
+            if self.unload_polls:
+                self.unload_polls -= 1
+                return False
+            return True
+        raise AssertionError(f"unexpected script: {script[:60]}")
+
+    def find_element(self, by, selector):
+        return FakeButton(self)
+
+
+@pytest.fixture(autouse=True)
+def quiet_pacing(monkeypatch):
+    monkeypatch.setattr(dice_bot, "pause", lambda seconds, phase_name="action_delay": None)
+    monkeypatch.setattr(dice_bot, "PACER", dice_bot.Pacer())
+    monkeypatch.setattr(dice_bot, "WAITER", dice_bot.AdaptiveWaiter())
+
+
+def test_the_wizard_is_only_probed_once_the_detail_page_is_gone():
+    driver = WizardDriver([
+        {"state": "next", "signature": "step-1"},
+        {"state": "submit", "signature": "step-2"},
+        {"state": "done"},
+    ])
+    assert dice_bot.run_easy_apply_wizard(driver, "Engineer") == dice_bot.OUTCOME_APPLIED
+    assert driver.probes and all(driver.probes)
+
+
+def test_screening_questions_stop_the_wizard():
+    driver = WizardDriver([{"state": "questions", "count": 2}], unload_polls=0)
+    assert dice_bot.run_easy_apply_wizard(driver, "Engineer") == dice_bot.OUTCOME_SCREENING_QUESTIONS
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+import dice_bot
+
+
+@pytest.fixture
+def job_index(tmp_path):
+    index = dice_bot.JobIndex(str(tmp_path / "jobs.sqlite3"))
+    yield index
+    index.close()
+
+
+def later(monkeypatch, seconds):
+    now = time.time()
+    monkeypatch.setattr(dice_bot.time, "time", lambda: now + seconds)
+
+
+def test_unknown_and_missing_jobs_are_opened(job_index):
+    assert job_index.skip_reason("unknown") is None
+    assert job_index.skip_reason(None) is None
+    job_index.record(None, dice_bot.OUTCOME_APPLIED) # Ignored
+
+
+@pytest.mark.parametrize("outcome", dice_bot.JOB_FINAL_OUTCOMES)
+def test_final_outcomes_are_never_retried(job_index, monkeypatch, outcome):
+    job_index.record("job-1", outcome)
+    later(monkeypatch, 365 * 24 * 3600)
+    assert job_index.skip_reason("job-1") == outcome
+
+
+@pytest.mark.parametrize("outcome, ttl", sorted(dice_bot.JOB_RETRY_TTL.items()))
+def test_other_outcomes_are_retried_after_their_ttl(job_index, monkeypatch, outcome, ttl):
+    job_index.record("job-1", outcome)
+    assert job_index.skip_reason("job-1") == outcome
+    later(monkeypatch, ttl - 60)
+    assert job_index.skip_reason("job-1") == outcome
+    later(monkeypatch, ttl + 60)
+    assert job_index.skip_reason("job-1") is None
+
+
+def test_outcomes_without_a_ttl_are_retried_at_once(job_index):
+    job_index.record("job-1", dice_bot.OUTCOME_THROTTLED)
+    assert job_index.skip_reason("job-1") is None
+
+
+def test_a_new_outcome_replaces_the_old_one(job_index):
+    job_index.record("job-1", dice_bot.OUTCOME_ERROR)
+    job_index.record("job-1", dice_bot.OUTCOME_APPLIED, "Engineer", "https://example.com/job-1")
+    assert job_index.skip_reason("job-1") == dice_bot.OUTCOME_APPLIED
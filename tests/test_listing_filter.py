@@ -0,0 +1,57 @@
+import pytest
+
+import dice_bot
+
+
+def job(title="Software Engineer", company="Example Corp", posted="Posted 2 days ago", easy_apply=True):
+    return {"title": title, "url": "https://example.com/job", "company": company, "posted": posted, "easy_apply": easy_apply}
+
+
+def test_an_empty_filter_keeps_everything():
+    listing_filter = dice_bot.ListingFilter()
+    assert not listing_filter
+    assert listing_filter.skip_reason(job()) is None
+
+
+def test_keywords_match_case_insensitive_substrings():
+    listing_filter = dice_bot.ListingFilter(include_keywords=["python", "C++"], exclude_keywords=["senior"])
+    assert listing_filter.skip_reason(job("Python Developer")) is None
+    assert listing_filter.skip_reason(job("c++ engineer")) is None
+    assert listing_filter.skip_reason(job("Java Developer")) == dice_bot.SKIP_TITLE_NOT_INCLUDED
+    assert listing_filter.skip_reason(job("SENIOR Python Developer")) == dice_bot.SKIP_TITLE_EXCLUDED
+
+
+def test_patterns_keep_their_own_groups_and_flags():
+    listing_filter = dice_bot.ListingFilter(include_patterns=[r"(x)y", r"(a)\1", r"(?P<level>ii+)", r"(?P<level>jr)\b"])
+    assert listing_filter.skip_reason(job("aa")) is None # The backreference still points at its own group
+    assert listing_filter.skip_reason(job("Engineer III")) is None
+    assert listing_filter.skip_reason(job("Jr Engineer")) is None
+    assert listing_filter.skip_reason(job("ab")) == dice_bot.SKIP_TITLE_NOT_INCLUDED
+    assert dice_bot.ListingFilter(exclude_patterns=[r"(?s)lead", "manager"]).skip_reason(job("Lead Engineer")) == dice_bot.SKIP_TITLE_EXCLUDED
+
+
+def test_patterns_are_searched_in_the_title():
+    listing_filter = dice_bot.ListingFilter(include_patterns=[r"engineer\s+i{2,}\b"])
+    assert listing_filter.skip_reason(job("Software Engineer III")) is None
+    assert listing_filter.skip_reason(job("Software Engineer")) == dice_bot.SKIP_TITLE_NOT_INCLUDED
+
+
+@pytest.mark.parametrize("pattern", ["([", "b(?i)c", r"(a)\2"])
+def test_an_invalid_pattern_raises_value_error(pattern):
+    with pytest.raises(ValueError, match="Invalid title pattern"):
+        dice_bot.ListingFilter(exclude_patterns=[pattern])
+
+
+def test_company_age_and_badge_rules():
+    listing_filter = dice_bot.ListingFilter(company_blocklist=["acme staffing"], max_age_days=7, easy_apply_only=True)
+    assert listing_filter.skip_reason(job(company="ACME Staffing LLC")) == dice_bot.SKIP_COMPANY_BLOCKED
+    assert listing_filter.skip_reason(job(posted="Posted 2 weeks ago")) == dice_bot.SKIP_TOO_OLD
+    assert listing_filter.skip_reason(job(posted="")) is None # An unreadable age is never dropped
+    assert listing_filter.skip_reason(job(easy_apply=False)) == dice_bot.SKIP_NO_EASY_APPLY_BADGE
+
+
+def test_apply_counts_the_dropped_listings():
+    listing_filter = dice_bot.ListingFilter(exclude_keywords=["manager"], max_age_days=2)
+    kept, skipped = listing_filter.apply([job("Engineer"), job("Manager"), job("Engineering Manager"), job(posted="Posted 3 days ago")])
+    assert [listing["title"] for listing in kept] == ["Engineer"]
+    assert skipped == {dice_bot.SKIP_TITLE_EXCLUDED: 2, dice_bot.SKIP_TOO_OLD: 1}
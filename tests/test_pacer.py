@@ -0,0 +1,88 @@
+import pytest
+
+import dice_bot
+
+
+@pytest.fixture
+def pauses(monkeypatch):
+    """Replaces pause() so wait_turn() returns at once; collects (seconds, phase) instead."""
+    calls = []
+    monkeypatch.setattr(dice_bot, "pause", lambda seconds, phase_name="action_delay": calls.append((seconds, phase_name)))
+    return calls
+
+
+def test_the_budget_caps_actions_per_minute(pauses):
+    pacer = dice_bot.Pacer(actions_per_minute=3)
+    for _ in range(3):
+        pacer.wait_turn(settle=False)
+    assert pauses == []
+    assert pacer.stats()["actions_last_minute"] == 3
+
+    pacer.wait_turn(settle=False)
+    seconds, phase_name = pauses[-1]
+    assert phase_name == "rate_budget"
+    assert 59 < seconds <= 60
+
+    pacer.wait_turn(settle=False) # Queues behind the reserved slot, not on top of it
+    assert 59 < pauses[-1][0] <= 60.1
+    assert len(pacer._slots) == 5
+
+
+def test_the_settle_delay_applies_under_the_budget(pauses):
+    pacer = dice_bot.Pacer()
+    pacer.wait_turn()
+    assert pauses[-1][1] == "action_delay"
+    assert pauses[-1][0] == pytest.approx(dice_bot.PACE_BASE_DELAY, abs=0.05)
+
+
+def test_fast_responses_shorten_the_delay_down_to_the_floor():
+    pacer = dice_bot.Pacer()
+    pacer.observe(0.5)
+    assert pacer.delay == pytest.approx(dice_bot.PACE_BASE_DELAY * dice_bot.PACE_SPEEDUP)
+    pacer.observe(dice_bot.PACE_FAST_RESPONSE + 1)
+    assert pacer.delay == pytest.approx(dice_bot.PACE_BASE_DELAY * dice_bot.PACE_SPEEDUP)
+    for _ in range(100):
+        pacer.observe(0.5)
+    assert pacer.delay == dice_bot.PACE_MIN_DELAY
+
+
+def test_throttling_backs_off_once_per_hold(pauses):
+    pacer = dice_bot.Pacer()
+    pacer.throttled("captcha")
+    pacer.throttled("captcha on another worker")
+    assert pacer.delay == dice_bot.PACE_BASE_DELAY * dice_bot.PACE_BACKOFF
+    assert pacer.throttle_events == 2
+
+    pacer.wait_turn(settle=False)
+    assert pauses[-1][1] == "throttle_backoff"
+
+    pacer._hold_until = 0.0 # The hold has run out
+    pacer.throttled("captcha again")
+    assert pacer.delay == dice_bot.PACE_BASE_DELAY * dice_bot.PACE_BACKOFF ** 2
+    for _ in range(10):
+        pacer._hold_until = 0.0
+        pacer.throttled("captcha")
+    assert pacer.delay == dice_bot.PACE_MAX_DELAY
+
+
+class NeverReady:
+    """Stands in for WebDriverWait when a page never finishes rendering."""
+
+    def __init__(self, driver, timeout, poll_frequency=None):
+        pass
+
+    def until(self, condition):
+        raise dice_bot.TimeoutException()
+
+
+@pytest.mark.parametrize("fast_samples, throttled", [(0, True), (dice_bot.WAIT_MIN_SAMPLES, False)])
+def test_only_a_full_length_classify_timeout_counts_as_throttling(monkeypatch, fast_samples, throttled):
+    pacer = dice_bot.Pacer()
+    waiter = dice_bot.AdaptiveWaiter()
+    for _ in range(fast_samples):
+        waiter._samples.setdefault("classify", dice_bot.deque(maxlen=dice_bot.WAIT_HISTORY_SIZE)).append(0.2)
+    monkeypatch.setattr(dice_bot, "PACER", pacer)
+    monkeypatch.setattr(dice_bot, "WAITER", waiter)
+    monkeypatch.setattr(dice_bot, "WebDriverWait", NeverReady)
+    assert dice_bot.apply_to_job(None, "Slow Job") == dice_bot.OUTCOME_ERROR
+    assert pacer.throttle_events == (1 if throttled else 0)
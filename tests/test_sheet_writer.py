@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+import dice_bot
+
+
+class QuotaError(Exception):
+    """Looks like a gspread APIError for HTTP 429."""
+
+    def __init__(self):
+        super().__init__("Quota exceeded")
+        self.response = type("Response", (), {"status_code": 429})()
+
+
+class FakeWorksheet:
+    def __init__(self, failures=0):
+        self.rows = []
+        self.calls = 0
+        self.failures = failures # Number of append_rows calls to fail with a quota error
+
+    def append_rows(self, rows):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise QuotaError()
+        self.rows.extend(rows)
+
+
+@pytest.fixture
+def spool_path(tmp_path):
+    return str(tmp_path / "spool" / "sheet.jsonl")
+
+
+def make_writer(worksheet, spool_path):
+    # Large batch size and interval so only the test triggers flushes
+    return dice_bot.SheetWriter(worksheet, spool_path, batch_size=1000, flush_interval=3600)
+
+
+def spooled_rows(path):
+    with open(path, encoding="utf-8") as f:
+        return [line for line in f if line.strip()]
+
+
+def test_quota_error_keeps_rows_spooled_and_backs_off(spool_path):
+    worksheet = FakeWorksheet(failures=2)
+    writer = make_writer(worksheet, spool_path)
+    writer.append_row(["a"])
+    writer.append_row(["b"])
+
+    assert writer.flush() is False
+    assert writer.pending() == 2
+    assert len(spooled_rows(spool_path)) == 2
+    assert writer._backoff == dice_bot.SHEET_BACKOFF_INITIAL
+    assert writer._retry_at > time.monotonic()
+    assert not writer._due()
+
+    assert writer.flush() is False
+    assert writer._backoff == dice_bot.SHEET_BACKOFF_INITIAL * 2
+
+    assert writer.flush() is True
+    assert worksheet.rows == [["a"], ["b"]]
+    assert writer.pending() == 0
+    assert spooled_rows(spool_path) == []
+    assert writer._backoff == 0.0
+    writer.close()
+
+
+def test_close_makes_a_final_flush(spool_path):
+    worksheet = FakeWorksheet()
+    writer = make_writer(worksheet, spool_path)
+    writer.append_row(["a"])
+    writer.close()
+    assert worksheet.rows == [["a"]]
+    assert writer.rows_written == 1
+    assert spooled_rows(spool_path) == []
+
+
+def test_unsent_rows_are_recovered_by_the_next_writer(spool_path):
+    writer = make_writer(FakeWorksheet(failures=1), spool_path)
+    writer.append_row(["a"])
+    writer.append_row(["b"])
+    writer.close() # The final flush hits the quota, so both rows stay in the spool
+    assert len(spooled_rows(spool_path)) == 2
+
+    worksheet = FakeWorksheet()
+    writer = make_writer(worksheet, spool_path)
+    assert writer.pending() == 2
+    writer.append_row(["c"])
+    writer.close()
+    assert worksheet.rows == [["a"], ["b"], ["c"]]
+    assert worksheet.calls == 1
+    assert spooled_rows(spool_path) == []
+
+
+def test_flushes_are_recorded_in_every_attached_run(spool_path):
+    first = dice_bot.RunMetrics()
+    second = dice_bot.RunMetrics()
+    first.bind()
+    try:
+        writer = make_writer(FakeWorksheet(), spool_path)
+    finally:
+        dice_bot.RunMetrics.unbind()
+    writer.attach(second)
+    writer.append_row(["a"])
+    writer.flush()
+    writer.detach(first)
+    writer.append_row(["b"])
+    writer.close()
+    assert first.close()["phases"]["sheet_write"]["count"] == 1
+    assert second.close()["phases"]["sheet_write"]["count"] == 2